@@ -1 +1,6 @@
 # __init__.py
+import os
+
+# Data shipped with the code (templates, market data), located relative to the
+# package rather than the working directory
+PACKAGE_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
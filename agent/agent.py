@@ -1,209 +1,444 @@
 from typing import Dict, List, Any, Optional
+from bisect import bisect_left
+import asyncio
 import json
+import time
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
 
-from .tools import search_job_market, draft_job_description, create_hiring_checklist
-from .memory import SessionMemory
-from .prompts import SYSTEM_PROMPT
+from .memory import acquire_session_memory, get_memory_registry
+from .runtime import get_runtime
+from .tokens import count_message_tokens
+from .tracing import get_tracer
+from .intents import classify
+from .extraction import extract_details, merge_details
+from .parallel import run_per_role, ROLE_TIMEOUT_SECONDS
 
-def create_hr_agent(openai_api_key: str, session_id: str = None):
-    """Create and return the HR hiring agent"""
-    # Initialize the memory
-    memory = SessionMemory(session_id)
-    
-    # Initialize the LLM
-    llm = ChatOpenAI(api_key=openai_api_key, model="gpt-4o", temperature=0.5)
-    
-    # Create the main prompt
-    hr_prompt = ChatPromptTemplate.from_messages([
-        ("system", SYSTEM_PROMPT),
-        MessagesPlaceholder(variable_name="chat_history"),
-        ("human", "{input}")
-    ])
-    
-    # Create a simple chain
-    chain = hr_prompt | llm | StrOutputParser()
-    
-    class HRAgent:
-        def __init__(self, chain, memory, tools):
-            self.chain = chain
-            self.memory = memory
-            self.tools = tools
-            self.job_descriptions = {}
-            self.hiring_plans = {}
-            self.hiring_details = {
-                "roles": [],
-                "skills": {},
-                "experience": {},
-                "timeline": None,
-                "budget": {}
-            }
-        
-        def invoke(self, input_state):
-            """Process the input and generate a response"""
-            # Extract messages from input state
-            user_messages = input_state.get("messages", [])
-            if not user_messages:
-                return {"messages": []}
-            
-            # Get the latest user message
-            latest_message = user_messages[-1]
-            user_input = latest_message.get("content", "")
-            
-            # Get chat history from memory
+# Default token budget for the chat history sent with each request
+DEFAULT_MAX_HISTORY_TOKENS = 6000
+
+# The latest exchange is always sent, even if it alone exceeds the budget
+MIN_RECENT_MESSAGES = 2
+
+# Bulky generated artifacts are not repeated in the pinned hiring summary
+UNPINNED_DETAIL_KEYS = ("job_descriptions", "hiring_plan", "hiring_plan_data")
+
+class HRAgent:
+    def __init__(self, chain, memory, tools, max_history_tokens=None, response_cache=None, tracer=None,
+                 role_timeout=ROLE_TIMEOUT_SECONDS):
+        self.chain = chain
+        self.memory = memory
+        self.tools = tools
+        self.max_history_tokens = max_history_tokens
+        self.response_cache = response_cache
+        # Per-session switch to bypass the shared response cache
+        self.cache_enabled = True
+        self.job_descriptions = {}
+        self.hiring_plans = {}
+        self.hiring_details = {
+            "roles": [],
+            "skills": {},
+            "experience": {},
+            "timeline": None,
+            "budget": {}
+        }
+        # Pick up details extracted earlier when resuming a saved session
+        self.hiring_details.update(memory.get("hiring_needs") or {})
+        # LangChain messages mirroring memory's conversation_history, kept in
+        # step incrementally; _token_prefix[i] is the token cost of messages[:i]
+        self._history_source = None
+        self._history_synced = 0
+        self._history_messages = []
+        self._token_prefix = [0]
+        self.last_time_to_first_token = None
+        # Per-stage latency histograms, shared process-wide by default
+        self.tracer = tracer or get_tracer()
+        # Seconds each role's job description or plan may take before it is skipped
+        self.role_timeout = role_timeout
+        # Releases this agent's hold on a registry memory; set by create_hr_agent
+        self._memory_lease = None
+    
+    def invoke(self, input_state):
+        """Process the input and generate a response"""
+        with self.tracer.stage("turn"):
+            try:
+                return self._invoke(input_state)
+            finally:
+                # End of turn: persist anything buffered by write-behind memory
+                with self.tracer.stage("flush"):
+                    self.memory.flush()
+    
+    def close(self):
+        """Flush and hand the session memory back to the registry; safe to call twice"""
+        self.memory.flush()
+        if self._memory_lease is not None:
+            self._memory_lease()
+    
+    def latency_stats(self):
+        """p50/p95/p99 latency per turn stage, in milliseconds"""
+        return self.tracer.summary()
+    
+    def _invoke(self, input_state):
+        user_input = self._latest_input(input_state)
+        if user_input is None:
+            return {"messages": []}
+        
+        # Get chat history from memory
+        with self.tracer.stage("history"):
             chat_history = self._get_chat_history()
+        
+        # Check if we need to process any tools directly
+        routed = self._route_tools(user_input, chat_history)
+        if routed is not None:
+            return routed
+        
+        # Run the chain to get a response, unless the same question was just answered
+        cache_key, response = self._cache_lookup(user_input, chat_history)
+        if response is None:
+            with self.tracer.stage("llm"):
+                response = self.chain.invoke({
+                    "chat_history": chat_history,
+                    "input": user_input
+                })
+            self._cache_store(cache_key, response)
+        
+        self._finish_turn(user_input, response)
+        
+        # Return the response
+        ai_message = AIMessage(content=response)
+        return {"messages": [ai_message]}
+    
+    async def ainvoke(self, input_state):
+        """Async variant of invoke(); blocking persistence runs in worker threads"""
+        with self.tracer.stage("turn"):
+            try:
+                user_input = self._latest_input(input_state)
+                if user_input is None:
+                    return {"messages": []}
+                
+                with self.tracer.stage("history"):
+                    chat_history = self._get_chat_history()
+                
+                # Tool paths write to memory, so keep them off the event loop too
+                routed = await asyncio.to_thread(self._route_tools, user_input, chat_history)
+                if routed is not None:
+                    return routed
+                
+                cache_key, response = self._cache_lookup(user_input, chat_history)
+                if response is None:
+                    with self.tracer.stage("llm"):
+                        response = await self.chain.ainvoke({
+                            "chat_history": chat_history,
+                            "input": user_input
+                        })
+                    self._cache_store(cache_key, response)
+                
+                await asyncio.to_thread(self._finish_turn, user_input, response)
+                return {"messages": [AIMessage(content=response)]}
+            finally:
+                with self.tracer.stage("flush"):
+                    await asyncio.to_thread(self.memory.flush)
+    
+    def stream(self, input_state):
+        """Process the input and yield the response text as it is generated
+        
+        Memory and hiring details are updated once the stream completes; the
+        delay before the first chunk is kept in last_time_to_first_token. The
+        "turn" and "llm" stages include the time the caller spends consuming chunks.
+        """
+        started = time.perf_counter_ns()
+        try:
+            user_input = self._latest_input(input_state)
+            if user_input is None:
+                return
             
-            # Check if we need to process any tools directly
-            if "generate job description" in user_input.lower() or "create job description" in user_input.lower():
-                return self._generate_job_descriptions(chat_history)
+            with self.tracer.stage("history"):
+                chat_history = self._get_chat_history()
             
-            if "hiring plan" in user_input.lower() or "checklist" in user_input.lower():
-                return self._generate_hiring_plans(chat_history)
+            routed = self._route_tools(user_input, chat_history)
+            if routed is not None:
+                self._record_first_token(started)
+                yield routed["messages"][0].content
+                return
             
-            # Run the chain to get a response
-            response = self.chain.invoke({
-                "chat_history": chat_history,
-                "input": user_input
-            })
+            cache_key, cached = self._cache_lookup(user_input, chat_history)
+            if cached is not None:
+                self._record_first_token(started)
+                chunks = [cached]
+                yield cached
+            else:
+                chunks = []
+                with self.tracer.stage("llm"):
+                    for chunk in self.chain.stream({"chat_history": chat_history, "input": user_input}):
+                        if not chunks:
+                            self._record_first_token(started)
+                        chunks.append(chunk)
+                        yield chunk
+                self._cache_store(cache_key, "".join(chunks))
             
-            # Update memory
-            self.memory.add_to_conversation("human", user_input)
-            self.memory.add_to_conversation("ai", response)
+            self._finish_turn(user_input, "".join(chunks))
+        finally:
+            with self.tracer.stage("flush"):
+                self.memory.flush()
+            self.tracer.record("turn", time.perf_counter_ns() - started)
+    
+    async def astream(self, input_state):
+        """Async variant of stream()"""
+        started = time.perf_counter_ns()
+        try:
+            user_input = self._latest_input(input_state)
+            if user_input is None:
+                return
             
-            # Extract hiring details from the conversation
-            self._extract_hiring_details(user_input, response)
+            with self.tracer.stage("history"):
+                chat_history = self._get_chat_history()
             
-            # Return the response
-            ai_message = AIMessage(content=response)
-            return {"messages": [ai_message]}
-        
-        def _get_chat_history(self):
-            """Get formatted chat history from memory"""
-            conversation = self.memory.get("conversation_history") or []
-            chat_history = []
+            routed = await asyncio.to_thread(self._route_tools, user_input, chat_history)
+            if routed is not None:
+                self._record_first_token(started)
+                yield routed["messages"][0].content
+                return
             
-            for message in conversation:
-                if message["role"] == "human":
-                    chat_history.append(HumanMessage(content=message["content"]))
-                elif message["role"] == "ai":
-                    chat_history.append(AIMessage(content=message["content"]))
+            cache_key, cached = self._cache_lookup(user_input, chat_history)
+            if cached is not None:
+                self._record_first_token(started)
+                chunks = [cached]
+                yield cached
+            else:
+                chunks = []
+                with self.tracer.stage("llm"):
+                    async for chunk in self.chain.astream({"chat_history": chat_history, "input": user_input}):
+                        if not chunks:
+                            self._record_first_token(started)
+                        chunks.append(chunk)
+                        yield chunk
+                self._cache_store(cache_key, "".join(chunks))
             
-            return chat_history
+            await asyncio.to_thread(self._finish_turn, user_input, "".join(chunks))
+        finally:
+            with self.tracer.stage("flush"):
+                await asyncio.to_thread(self.memory.flush)
+            self.tracer.record("turn", time.perf_counter_ns() - started)
+    
+    def _record_first_token(self, started_ns):
+        elapsed_ns = time.perf_counter_ns() - started_ns
+        self.last_time_to_first_token = elapsed_ns / 1e9
+        self.tracer.record("first_token", elapsed_ns)
+    
+    def _latest_input(self, input_state):
+        """Get the latest user message from the input state, or None"""
+        user_messages = input_state.get("messages", [])
+        if not user_messages:
+            return None
+        return user_messages[-1].get("content", "")
+    
+    def _route_tools(self, user_input, chat_history):
+        """Handle requests served directly by the tools; None if the LLM should answer"""
+        intents = classify(user_input)["intents"]
+        if "job_description" in intents:
+            return self._generate_job_descriptions(chat_history)
         
-        def _extract_hiring_details(self, user_input, response):
-            """Extract hiring details from conversation"""
-            combined_text = (user_input + " " + response).lower()
-            
-            # Extract roles
-            if "founding engineer" in combined_text or "engineer" in combined_text:
-                if "founding engineer" not in self.hiring_details["roles"]:
-                    self.hiring_details["roles"].append("founding engineer")
-            
-            if "genai intern" in combined_text or "intern" in combined_text:
-                if "genai intern" not in self.hiring_details["roles"]:
-                    self.hiring_details["roles"].append("genai intern")
-            
-            # Extract skills (simplified)
-            if "skill" in combined_text:
-                if "founding engineer" in self.hiring_details["roles"] and "founding engineer" not in self.hiring_details["skills"]:
-                    self.hiring_details["skills"]["founding engineer"] = ["Full-stack development", "System architecture", "DevOps"]
-                
-                if "genai intern" in self.hiring_details["roles"] and "genai intern" not in self.hiring_details["skills"]:
-                    self.hiring_details["skills"]["genai intern"] = ["Python", "ML/AI fundamentals", "LangChain/LangGraph"]
-            
-            # Extract experience
-            if "experience" in combined_text or "year" in combined_text:
-                if "founding engineer" in self.hiring_details["roles"] and "founding engineer" not in self.hiring_details["experience"]:
-                    self.hiring_details["experience"]["founding engineer"] = "3-5 years"
-                
-                if "genai intern" in self.hiring_details["roles"] and "genai intern" not in self.hiring_details["experience"]:
-                    self.hiring_details["experience"]["genai intern"] = "Entry-level"
-            
-            # Extract timeline
-            if "timeline" in combined_text or "week" in combined_text:
-                self.hiring_details["timeline"] = 8  # Default to 8 weeks
-            
-            # Extract budget
-            if "budget" in combined_text or "$" in combined_text or "salary" in combined_text:
-                if "founding engineer" in self.hiring_details["roles"] and "founding engineer" not in self.hiring_details["budget"]:
-                    self.hiring_details["budget"]["founding engineer"] = "$120,000-$150,000"
-                
-                if "genai intern" in self.hiring_details["roles"] and "genai intern" not in self.hiring_details["budget"]:
-                    self.hiring_details["budget"]["genai intern"] = "$30-40/hour"
-            
-            # Update memory with extracted details
-            self.memory.update("hiring_needs", self.hiring_details)
+        if "hiring_plan" in intents:
+            return self._generate_hiring_plans(chat_history)
         
-        def _generate_job_descriptions(self, chat_history):
-            """Generate job descriptions using the tool"""
-            if not self.hiring_details["roles"]:
-                response = "I need to know which roles you're looking to hire for before I can create job descriptions. Could you please specify the roles?"
-                self.memory.add_to_conversation("ai", response)
-                return {"messages": [AIMessage(content=response)]}
-            
-            job_descriptions = {}
-            for role in self.hiring_details["roles"]:
-                skills = self.hiring_details["skills"].get(role, ["Relevant technical skills"])
-                experience = self.hiring_details["experience"].get(role, "Appropriate")
-                
-                job_descriptions[role] = draft_job_description(
-                    role=role,
-                    skills=skills,
-                    experience_level=experience
-                )
-            
-            # Update the hiring details
-            self.hiring_details["job_descriptions"] = job_descriptions
+        return None
+    
+    def _cache_lookup(self, user_input, chat_history):
+        """Return (cache key, cached response); both None when caching is off"""
+        if self.response_cache is None or not self.cache_enabled:
+            return None, None
+        with self.tracer.stage("cache"):
+            key = self.response_cache.make_key(user_input, chat_history)
+            return key, self.response_cache.get(key)
+    
+    def _cache_store(self, cache_key, response):
+        if cache_key is not None and response:
+            self.response_cache.put(cache_key, response)
+    
+    def _finish_turn(self, user_input, response):
+        """Persist a completed LLM exchange and extract hiring details from it"""
+        # Update memory
+        with self.tracer.stage("persist"):
+            self.memory.add_to_conversation("human", user_input)
+            self.memory.add_to_conversation("ai", response)
+        
+        # Extract hiring details from the conversation
+        with self.tracer.stage("extract"):
+            self._extract_hiring_details(user_input, response)
+    
+    def _sync_history(self):
+        """Bring the cached message list up to date with memory"""
+        conversation = self.memory.get("conversation_history") or []
+        if conversation is not self._history_source or len(conversation) < self._history_synced:
+            # History was replaced or reloaded behind our back: start over
+            self._history_source = conversation
+            self._history_synced = 0
+            self._history_messages = []
+            self._token_prefix = [0]
+        
+        # Only messages added since the last turn are converted and counted
+        for message in conversation[self._history_synced:]:
+            if message["role"] == "human":
+                self._history_messages.append(HumanMessage(content=message["content"]))
+            elif message["role"] == "ai":
+                self._history_messages.append(AIMessage(content=message["content"]))
+            else:
+                continue
+            self._token_prefix.append(self._token_prefix[-1] + count_message_tokens(message["content"]))
+        self._history_synced = len(conversation)
+    
+    def _get_chat_history(self):
+        """Get formatted chat history from memory, trimmed to the token budget"""
+        self._sync_history()
+        pinned = self._pinned_details_message()
+        total = len(self._history_messages)
+        
+        if self.max_history_tokens is None:
+            start = 0
+        else:
+            budget = self.max_history_tokens - (count_message_tokens(pinned.content) if pinned else 0)
+            # Longest suffix of the history whose token cost fits the budget
+            start = bisect_left(self._token_prefix, self._token_prefix[-1] - budget, 0, total + 1)
+            start = min(start, max(0, total - MIN_RECENT_MESSAGES))
+        
+        chat_history = self._history_messages[start:]
+        if pinned:
+            chat_history.insert(0, pinned)
+        return chat_history
+    
+    def _pinned_details_message(self):
+        """Summarize extracted hiring details so they survive history trimming"""
+        if not self.hiring_details.get("roles"):
+            return None
+        details = {k: v for k, v in self.hiring_details.items() if k not in UNPINNED_DETAIL_KEYS}
+        return SystemMessage(content="Hiring details gathered so far in this conversation:\n" + json.dumps(details))
+    
+    def _extract_hiring_details(self, user_input, response):
+        """Extract hiring details from the latest exchange"""
+        # The user's own words override earlier values; the reply only fills
+        # gaps for roles the user has already asked about
+        changed = merge_details(self.hiring_details, extract_details(user_input))
+        changed |= merge_details(self.hiring_details, extract_details(response), overwrite=False, add_roles=False)
+        
+        # Update memory with extracted details
+        if changed:
             self.memory.update("hiring_needs", self.hiring_details)
-            
-            # Create a response message
-            response = "I've created job descriptions based on your requirements:\n\n"
-            for role, desc in job_descriptions.items():
-                response += f"## {role.upper()} JOB DESCRIPTION\n{desc}\n\n"
-            response += "Would you like me to make any adjustments to these job descriptions or help create a hiring plan?"
-            
+    
+    def _generate_job_descriptions(self, chat_history):
+        """Generate job descriptions using the tool"""
+        if not self.hiring_details["roles"]:
+            response = "I need to know which roles you're looking to hire for before I can create job descriptions. Could you please specify the roles?"
             self.memory.add_to_conversation("ai", response)
             return {"messages": [AIMessage(content=response)]}
         
-        def _generate_hiring_plans(self, chat_history):
-            """Generate hiring plans using the tool"""
-            if not self.hiring_details["roles"]:
-                response = "I need to know which roles you're looking to hire for before I can create hiring plans. Could you please specify the roles?"
-                self.memory.add_to_conversation("ai", response)
-                return {"messages": [AIMessage(content=response)]}
-            
-            timeline = self.hiring_details.get("timeline", 8)
-            hiring_plans = {}
-            
-            for role in self.hiring_details["roles"]:
-                hiring_plans[role] = create_hiring_checklist(
-                    role=role,
-                    timeline_weeks=timeline
-                )
-            
-            # Update the hiring details
-            self.hiring_details["hiring_plan"] = hiring_plans
+        def draft(role):
+            with self.tracer.stage("draft_job_description"):
+                return self.tools["draft_job_description"].invoke({
+                    "role": role,
+                    "skills": self.hiring_details["skills"].get(role, ["Relevant technical skills"]),
+                    "experience_level": self.hiring_details["experience"].get(role, "Appropriate")
+                })
+        
+        # Roles are drafted concurrently; results come back in role order
+        job_descriptions, errors = run_per_role(self.hiring_details["roles"], draft, self.role_timeout)
+        
+        # Update the hiring details
+        self.hiring_details["job_descriptions"] = job_descriptions
+        with self.tracer.stage("persist"):
             self.memory.update("hiring_needs", self.hiring_details)
-            
-            # Create a response message
-            response = "Based on your requirements, I've created a hiring plan for each role:\n\n"
-            for role, plan in hiring_plans.items():
-                response += f"## {role.upper()} HIRING PLAN\n```json\n{plan}\n```\n\n"
-            response += "Is there anything else you'd like me to help with regarding your hiring process?"
-            
+        
+        # Create a response message
+        response = "I've created job descriptions based on your requirements:\n\n"
+        for role, desc in job_descriptions.items():
+            response += f"## {role.upper()} JOB DESCRIPTION\n{desc}\n\n"
+        response += self._failure_note(errors, "job descriptions")
+        response += "Would you like me to make any adjustments to these job descriptions or help create a hiring plan?"
+        
+        with self.tracer.stage("persist"):
+            self.memory.add_to_conversation("ai", response)
+        return {"messages": [AIMessage(content=response)]}
+    
+    def _generate_hiring_plans(self, chat_history):
+        """Generate hiring plans using the tool"""
+        if not self.hiring_details["roles"]:
+            response = "I need to know which roles you're looking to hire for before I can create hiring plans. Could you please specify the roles?"
             self.memory.add_to_conversation("ai", response)
             return {"messages": [AIMessage(content=response)]}
+        
+        # Default to 8 weeks when no timeline has been mentioned
+        timeline = self.hiring_details.get("timeline") or 8
+        
+        def plan(role):
+            with self.tracer.stage("create_hiring_checklist"):
+                return self.tools["create_hiring_checklist"].invoke({"role": role, "timeline_weeks": timeline})
+        
+        # Roles are planned concurrently; roles needing the same checklist still
+        # share one scheduled, serialized plan through the tool's cache
+        hiring_plans, errors = run_per_role(self.hiring_details["roles"], plan, self.role_timeout)
+        
+        # Update the hiring details; plans are kept parsed too so readers skip json.loads
+        self.hiring_details["hiring_plan"] = hiring_plans
+        self.hiring_details["hiring_plan_data"] = {role: json.loads(plan) for role, plan in hiring_plans.items()}
+        with self.tracer.stage("persist"):
+            self.memory.update("hiring_needs", self.hiring_details)
+        
+        # Create a response message
+        response = "Based on your requirements, I've created a hiring plan for each role:\n\n"
+        for role, plan in hiring_plans.items():
+            response += f"## {role.upper()} HIRING PLAN\n```json\n{plan}\n```\n\n"
+        response += self._failure_note(errors, "hiring plans")
+        response += "Is there anything else you'd like me to help with regarding your hiring process?"
+        
+        with self.tracer.stage("persist"):
+            self.memory.add_to_conversation("ai", response)
+        return {"messages": [AIMessage(content=response)]}
+
+    @staticmethod
+    def _failure_note(errors, artifact):
+        """Tell the user which roles were left out of a partial result"""
+        if not errors:
+            return ""
+        roles = ", ".join(errors)
+        return f"I couldn't finish the {artifact} for: {roles}. Ask again and I'll retry them.\n\n"
+
+def create_hr_agent(openai_api_key: str, session_id: str = None, write_behind: bool = False,
+                    max_history_tokens: Optional[int] = DEFAULT_MAX_HISTORY_TOKENS,
+                    model: str = "gpt-4o", temperature: float = 0.5,
+                    model_backend: Optional[str] = None):
+    """Create and return the HR hiring agent
+
+    The LLM client and chain come from the process-wide runtime for
+    (model_backend, model, temperature); the session memory comes from the process-wide
+    registry, shared with anything else holding the same session. It is handed back on
+    close() or, failing that, when the agent is garbage collected.
+    max_history_tokens caps the chat history sent to the model; None sends it all.
+    model_backend names an entry in runtime.MODEL_BACKENDS ("openai" or the offline
+    "fake"); it defaults to the HR_AGENT_MODEL_BACKEND environment variable.
+    """
+    # Share the session's one loaded memory with every other holder in the process
+    memory = acquire_session_memory(session_id, write_behind=write_behind)
+    
+    # Reuse the shared client, prompt and chain
+    runtime = get_runtime(openai_api_key, model, temperature, model_backend)
+    
+    # Create the agent; its hold on the memory ends with close() or when it is collected
+    agent = HRAgent(runtime.chain, memory, runtime.tools, max_history_tokens=max_history_tokens,
+                    response_cache=runtime.response_cache)
+    agent._memory_lease = get_memory_registry().lease(agent, memory)
+    return agent
+
+async def ainvoke_many(requests, max_concurrency: Optional[int] = None):
+    """Run (agent, input_state) pairs concurrently on the current event loop
+    
+    Results come back in request order. Each agent should appear at most once,
+    since a session's turns must run one after another.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
     
-    # Set up tools
-    tools = {
-        "search_job_market": search_job_market,
-        "draft_job_description": draft_job_description,
-        "create_hiring_checklist": create_hiring_checklist
-    }
+    async def run_one(agent, input_state):
+        if semaphore is None:
+            return await agent.ainvoke(input_state)
+        async with semaphore:
+            return await agent.ainvoke(input_state)
     
-    # Create and return the agent
-    return HRAgent(chain, memory, tools)
\ No newline at end of file
+    return await asyncio.gather(*(run_one(agent, input_state) for agent, input_state in requests))
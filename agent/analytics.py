@@ -0,0 +1,355 @@
+import base64
+import copy
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from .storage import StorageBackend, get_storage_backend
+
+logger = logging.getLogger(__name__)
+
+# Persist the in-memory rollup once this many events or seconds have been folded
+# into it since the last checkpoint, so a fresh process only replays the tail
+ROLLUP_CHECKPOINT_EVENTS = 1000
+ROLLUP_CHECKPOINT_SECONDS = 60.0
+
+def _encode_column(values: np.ndarray) -> str:
+    """Pack a numeric/datetime column as base64 for the JSON checkpoint"""
+    return base64.b64encode(np.ascontiguousarray(values).view(np.int64).tobytes()).decode("ascii")
+
+def _decode_column(data: str, dtype: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.int64).astype(dtype)
+
+class AnalyticsRollup:
+    """Incremental, columnar aggregate of the (sharded) analytics event log
+
+    Per-session aggregates live in NumPy columns (start, last message, last
+    activity, message count) indexed by a session_id -> row map, plus tool and
+    role counters and a backend cursor marking the last event folded in.
+    Refreshing reads only the events appended since. Aggregations are vectorized
+    over the columns and memoized until new events arrive.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self.lock = threading.RLock()
+        self.version = 0
+        self._memo: Dict[str, Tuple[int, Any]] = {}
+        # Held for a whole checkpoint, so at most one runs at a time
+        self._checkpoint_lock = threading.Lock()
+        self._last_checkpoint = time.monotonic()
+        self._load_checkpoint()
+
+    def __len__(self) -> int:
+        return len(self.session_ids)
+
+    def _reset(self) -> None:
+        """Empty every aggregate and the cursor"""
+        self.cursor: Any = None
+        self.session_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.start_time = np.empty(self.INITIAL_CAPACITY, dtype="datetime64[us]")
+        self.end_time = np.empty(self.INITIAL_CAPACITY, dtype="datetime64[us]")
+        self.last_active = np.empty(self.INITIAL_CAPACITY, dtype="datetime64[us]")
+        self.messages_count = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+        # Sparse: only sessions that used a tool have an entry
+        self.session_tools: Dict[str, List[str]] = {}
+        self.tool_usage: Dict[str, int] = {}
+        self.role_requests: Dict[str, int] = {}
+        self._unsaved_events = 0
+
+    def _load_checkpoint(self) -> None:
+        """Seed from the persisted rollup, upgrading older layouts"""
+        self._reset()
+        data = self.backend.load_analytics()
+        self.tool_usage = data.get("tool_usage", {})
+        self.role_requests = data.get("role_requests", {})
+        self.cursor = data.get("cursor")
+
+        if "session_ids" in data:
+            ids = data["session_ids"].split("\n") if data["session_ids"] else []
+            self.session_ids = ids
+            self._rows = {session_id: row for row, session_id in enumerate(ids)}
+            self._reserve(len(ids))
+            for column in ("start_time", "end_time", "last_active"):
+                getattr(self, column)[:len(ids)] = _decode_column(data[column], "datetime64[us]")
+            self.messages_count[:len(ids)] = _decode_column(data["messages_count"], "int64")
+            self.session_tools = data.get("session_tools", {})
+            return
+
+        # Row-oriented documents: a session list (legacy) or dict keyed by id
+        sessions = data.get("sessions", [])
+        if isinstance(sessions, dict):
+            sessions = list(sessions.values())
+        for session in sessions:
+            row = self._row(session["session_id"], session["start_time"])
+            self.end_time[row] = self.start_time[row] + np.timedelta64(
+                int(session.get("duration_seconds", 0) * 1e6), "us")
+            self.last_active[row] = np.datetime64(session.get("last_active", session["start_time"]), "us")
+            self.messages_count[row] = session.get("messages_count", 0)
+            if session.get("tools_used"):
+                self.session_tools[session["session_id"]] = list(session["tools_used"])
+
+    def _reserve(self, size: int) -> None:
+        """Grow the columns geometrically to hold at least `size` rows"""
+        capacity = len(self.messages_count)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for column in ("start_time", "end_time", "last_active", "messages_count"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+
+    def _row(self, session_id: str, timestamp: str) -> int:
+        """Return the row for a session, appending one if it is new"""
+        row = self._rows.get(session_id)
+        if row is None:
+            row = len(self.session_ids)
+            self._reserve(row + 1)
+            self.session_ids.append(session_id)
+            self._rows[session_id] = row
+            ts = np.datetime64(timestamp, "us")
+            self.start_time[row] = self.end_time[row] = self.last_active[row] = ts
+            self.messages_count[row] = 0
+        return row
+
+    def refresh(self) -> bool:
+        """Fold events logged since the last refresh; returns True if any were new"""
+        with self.lock:
+            reloaded = not self.backend.analytics_cursor_current(self.cursor)
+            if reloaded:
+                # Another process retired events we may not have read yet, after
+                # checkpointing them: resume from its checkpoint instead
+                self._load_checkpoint()
+            events, self.cursor = self.backend.read_analytics_events(self.cursor)
+            for event in events:
+                self._fold(event)
+
+            if events or reloaded:
+                self.version += 1
+            self._unsaved_events += len(events)
+            if self._unsaved_events and not self._checkpoint_lock.locked() and (
+                self._unsaved_events >= ROLLUP_CHECKPOINT_EVENTS
+                or time.monotonic() - self._last_checkpoint >= ROLLUP_CHECKPOINT_SECONDS
+            ):
+                # Encoding and writing a large rollup takes a while; keep it off
+                # the request that happened to trigger it
+                threading.Thread(target=self._checkpoint_in_background, name="analytics-checkpoint",
+                                 daemon=True).start()
+            return bool(events)
+
+    def _checkpoint_in_background(self) -> None:
+        try:
+            self.checkpoint()
+        except Exception:
+            # Unsaved events stay in the shards and are folded again on the next load
+            logger.exception("Analytics checkpoint failed")
+
+    def checkpoint(self) -> None:
+        """Persist the rollup together with its event cursor
+
+        Only copying the aggregates holds the rollup lock; encoding and
+        writing them does not, so refreshes carry on meanwhile. Event logs the
+        saved cursor has consumed for good are then retired, and the rollup
+        is saved again without them.
+        """
+        with self._checkpoint_lock:
+            saved = self._snapshot()
+            self._save(saved)
+            cursor = self.backend.retire_analytics_events(saved["cursor"])
+            if cursor != saved["cursor"]:
+                with self.lock:
+                    if isinstance(self.cursor, dict):
+                        # Retired shards' writers have exited, so their offsets cannot have moved
+                        self.cursor = {name: offset for name, offset in self.cursor.items()
+                                       if name in cursor or name not in saved["cursor"]}
+                self._save(self._snapshot())
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Copy the aggregates and cursor they cover, and reset the checkpoint counters"""
+        with self.lock:
+            n = len(self)
+            snapshot = {
+                "cursor": copy.deepcopy(self.cursor),
+                "session_ids": list(self.session_ids),
+                "start_time": self.start_time[:n].copy(),
+                "end_time": self.end_time[:n].copy(),
+                "last_active": self.last_active[:n].copy(),
+                "messages_count": self.messages_count[:n].copy(),
+                "session_tools": {session_id: list(tools) for session_id, tools in self.session_tools.items()},
+                "tool_usage": dict(self.tool_usage),
+                "role_requests": dict(self.role_requests)
+            }
+            self._unsaved_events = 0
+            self._last_checkpoint = time.monotonic()
+            return snapshot
+
+    def _save(self, snapshot: Dict[str, Any]) -> None:
+        data = dict(snapshot, session_ids="\n".join(snapshot["session_ids"]))
+        for column in ("start_time", "end_time", "last_active", "messages_count"):
+            data[column] = _encode_column(snapshot[column])
+        self.backend.save_analytics(data)
+
+    def _fold(self, event: Dict[str, Any]) -> None:
+        """Apply one event to the aggregates"""
+        kind, timestamp = event["type"], event["timestamp"]
+        session_id = event["session_id"]
+        row = self._row(session_id, timestamp)
+
+        # Shards are merged in arbitrary order, so every update must commute
+        ts = np.datetime64(timestamp, "us")
+        if ts < self.start_time[row]:
+            self.start_time[row] = ts
+        if kind in ("session_start", "message"):
+            self.last_active[row] = max(self.last_active[row], ts)
+        if kind == "message":
+            self.messages_count[row] += 1
+            self.end_time[row] = max(self.end_time[row], ts)
+        elif kind == "tool":
+            tool_name = event["tool"]
+            self.tool_usage[tool_name] = self.tool_usage.get(tool_name, 0) + 1
+            tools = self.session_tools.setdefault(session_id, [])
+            if tool_name not in tools:
+                tools.append(tool_name)
+        elif kind == "role":
+            role = event["role"]
+            self.role_requests[role] = self.role_requests.get(role, 0) + 1
+
+    def _memoized(self, name: str, compute) -> Any:
+        """Return a cached aggregate, recomputing it only after new events"""
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        value = compute()
+        self._memo[name] = (self.version, value)
+        return value
+
+    def durations(self) -> np.ndarray:
+        """Session durations in seconds: first event to last message"""
+        n = len(self)
+        durations = (self.end_time[:n] - self.start_time[:n]) / np.timedelta64(1, "s")
+        # Sessions without messages have not accrued any duration yet
+        return np.where(self.messages_count[:n] > 0, durations, 0.0)
+
+    def usage_stats(self) -> Dict[str, Any]:
+        def compute() -> Dict[str, Any]:
+            n = len(self)
+            return {
+                "total_sessions": n,
+                "avg_session_duration": float(self.durations().mean()) if n else 0.0,
+                "most_requested_role": max(self.role_requests.items(), key=lambda x: x[1])[0] if self.role_requests else None,
+                "top_tools": sorted(self.tool_usage.items(), key=lambda x: x[1], reverse=True)[:3]
+            }
+        return self._memoized("usage_stats", compute)
+
+    def session_activity(self) -> Dict[str, np.ndarray]:
+        """Sessions started per calendar day, as parallel date/count arrays"""
+        def compute() -> Dict[str, np.ndarray]:
+            days, counts = np.unique(self.start_time[:len(self)].astype("datetime64[D]"), return_counts=True)
+            return {"date": np.datetime_as_string(days), "sessions": counts}
+        return self._memoized("session_activity", compute)
+
+    def role_distribution(self) -> Dict[str, np.ndarray]:
+        """Role request counts as parallel role/count arrays"""
+        def compute() -> Dict[str, np.ndarray]:
+            return {
+                "role": np.array(list(self.role_requests), dtype=object),
+                "count": np.fromiter(self.role_requests.values(), dtype=np.int64, count=len(self.role_requests))
+            }
+        return self._memoized("role_distribution", compute)
+
+# One shared rollup per backend, so every tracker in the process folds each event once
+_rollups: "weakref.WeakKeyDictionary[StorageBackend, AnalyticsRollup]" = weakref.WeakKeyDictionary()
+_rollups_lock = threading.Lock()
+
+def get_rollup(backend: StorageBackend) -> AnalyticsRollup:
+    """Return the process-wide rollup for a backend"""
+    with _rollups_lock:
+        rollup = _rollups.get(backend)
+        if rollup is None:
+            rollup = _rollups[backend] = AnalyticsRollup(backend)
+        return rollup
+
+class AnalyticsTracker:
+    def __init__(self, session_id: str, backend: Optional[StorageBackend] = None):
+        self.session_id = session_id
+        self.backend = backend or get_storage_backend()
+        self.session_started = datetime.now()
+        self._track_session_start()
+
+    def _log_event(self, kind: str, **fields: Any) -> None:
+        """Append an event to the analytics log"""
+        event = {"type": kind, "session_id": self.session_id, "timestamp": datetime.now().isoformat()}
+        event.update(fields)
+        self.backend.append_analytics_event(event)
+
+    def _refreshed_rollup(self) -> AnalyticsRollup:
+        rollup = get_rollup(self.backend)
+        rollup.refresh()
+        return rollup
+
+    def _load_analytics(self) -> Dict[str, Any]:
+        """Get the current analytics rollup in the row-oriented usage_stats layout"""
+        rollup = self._refreshed_rollup()
+        with rollup.lock:
+            durations = rollup.durations()
+            sessions = [
+                {
+                    "session_id": session_id,
+                    "start_time": str(rollup.start_time[row]),
+                    "last_active": str(rollup.last_active[row]),
+                    "duration_seconds": float(durations[row]),
+                    "messages_count": int(rollup.messages_count[row]),
+                    "tools_used": list(rollup.session_tools.get(session_id, []))
+                }
+                for row, session_id in enumerate(rollup.session_ids)
+            ]
+            return {
+                "sessions": sessions,
+                "tool_usage": dict(rollup.tool_usage),
+                "role_requests": dict(rollup.role_requests)
+            }
+
+    def _track_session_start(self) -> None:
+        """Track a new session"""
+        self._log_event("session_start")
+
+    def track_message(self, role: str, content: str) -> None:
+        """Track a message in the conversation"""
+        self._log_event("message", role=role)
+
+    def track_tool_usage(self, tool_name: str) -> None:
+        """Track tool usage"""
+        self._log_event("tool", tool=tool_name)
+
+    def track_role_request(self, role: str) -> None:
+        """Track which roles are being requested"""
+        self._log_event("role", role=role)
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Get usage statistics for display"""
+        rollup = self._refreshed_rollup()
+        with rollup.lock:
+            return rollup.usage_stats()
+
+    def get_session_activity(self) -> Dict[str, np.ndarray]:
+        """Get the number of sessions started per day"""
+        rollup = self._refreshed_rollup()
+        with rollup.lock:
+            return rollup.session_activity()
+
+    def get_role_distribution(self) -> Dict[str, np.ndarray]:
+        """Get how often each role has been requested"""
+        rollup = self._refreshed_rollup()
+        with rollup.lock:
+            return rollup.role_distribution()
@@ -0,0 +1,283 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Once the disk tier outgrows its cap, the oldest files are deleted until
+# this fraction of the cap is left, so pruning runs once per many writes
+DISK_PRUNE_FRACTION = 0.75
+
+def normalize_input(text: str) -> str:
+    """Canonical form of a user message: case, spacing and trailing punctuation folded"""
+    return _WHITESPACE.sub(" ", text.strip().lower()).rstrip(" ?!.")
+
+class ResponseCache:
+    """LRU cache of LLM responses with TTLs and an optional on-disk tier
+
+    Keys hash the system prompt, any pinned system messages, the last
+    `history_window` chat messages and the normalized user input, so the same
+    question asked in the same context is answered without a model round trip.
+    The disk tier (one JSON file per key) survives restarts and is shared by
+    every process pointed at the same directory. It holds at most about
+    max_disk_entries files: expired files are deleted when read, and the
+    least recently written go first when it is full. Disk errors only cost
+    the cache entry, never the turn.
+    """
+
+    def __init__(self, namespace: str, system_prompt: str, max_entries: int = 512,
+                 ttl_seconds: float = 3600.0, history_window: int = 4,
+                 disk_dir: Optional[str] = None, max_disk_entries: int = 4096):
+        self.namespace = namespace
+        self.system_prompt = system_prompt
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.history_window = history_window
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        # Files in disk_dir as of the last count plus writes since; None until counted
+        self._disk_files: Optional[int] = None
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        # key -> (expires_at wall-clock time, response); most recently used last
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def make_key(self, user_input: str, chat_history: List[Any]) -> str:
+        """Hash the context that determines the model's answer"""
+        pinned = [m.content for m in chat_history if m.type == "system"]
+        conversation = [m for m in chat_history if m.type != "system"]
+        recent = conversation[-self.history_window:] if self.history_window else []
+        payload = json.dumps([
+            self.namespace,
+            self.system_prompt,
+            pinned,
+            [[m.type, m.content] for m in recent],
+            normalize_input(user_input)
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a live cached response, counting the hit or miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.disk_dir:
+            entry = self._read_disk(key, now)
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return entry[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        try:
+            with open(self._disk_path(key), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data["expires_at"] <= now:
+            self._remove(self._disk_path(key))
+            return None
+        return data["expires_at"], data["response"]
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            # Already removed by another process or thread
+            pass
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response in memory and, if enabled, on disk"""
+        entry = (time.time() + self.ttl_seconds, response)
+        with self._lock:
+            self._remember(key, entry)
+
+        if self.disk_dir:
+            self._write_disk(key, entry)
+
+    def _write_disk(self, key: str, entry: Tuple[float, str]) -> None:
+        tmp_file = None
+        try:
+            # A unique temporary name, so concurrent writers of one key never share it
+            fd, tmp_file = tempfile.mkstemp(dir=self.disk_dir, prefix=f"{key}.", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"expires_at": entry[0], "response": entry[1]}, f)
+            os.replace(tmp_file, self._disk_path(key))
+        except OSError:
+            logger.warning("Could not write response cache entry to %s", self.disk_dir, exc_info=True)
+            if tmp_file:
+                self._remove(tmp_file)
+            return
+
+        with self._lock:
+            if self._disk_files is not None:
+                self._disk_files += 1
+            prune = self._disk_files is None or self._disk_files > self.max_disk_entries
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Recount the disk tier, deleting the oldest files if it is over its cap"""
+        try:
+            names = [name for name in os.listdir(self.disk_dir) if name.endswith(".json")]
+        except OSError:
+            return
+        keep = len(names)
+        if len(names) > self.max_disk_entries:
+            keep = int(self.max_disk_entries * DISK_PRUNE_FRACTION)
+            aged = []
+            for name in names:
+                path = os.path.join(self.disk_dir, name)
+                try:
+                    aged.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+            aged.sort()
+            for _, path in aged[:len(aged) - keep]:
+                self._remove(path)
+        with self._lock:
+            self._disk_files = keep
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for display"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries)
+            }
+
+class MemoCache:
+    """Bounded LRU cache of a pure function's results
+
+    Entries are keyed by the function's normalized arguments. If `version` is
+    given, it is called on every lookup and the cache empties itself when
+    the value changes (for example, when the templates behind a tool are edited).
+    """
+
+    def __init__(self, max_entries: int = 256, version: Optional[Callable[[], Any]] = None):
+        self.max_entries = max_entries
+        self.version = version
+        self._version_seen = None
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self) -> None:
+        current = self.version()
+        if current != self._version_seen:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version_seen = current
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss"""
+        with self._lock:
+            if self.version is not None:
+                self._check_version()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Computed outside the lock; a concurrent miss on the same key just computes twice
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for display"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries)
+            }
+
+def memoize(normalize: Callable[..., Dict[str, Any]], max_entries: int = 256,
+            version: Optional[Callable[[], Any]] = None):
+    """Decorate a pure function with a MemoCache keyed by its normalized arguments
+
+    normalize takes the call's arguments and returns canonical keyword
+    arguments (hashable values); the function is called with those, so equal
+    keys always produce equal results. The wrapper keeps the function's
+    signature, so it can sit under LangChain's @tool, and exposes the cache as `.cache`.
+    """
+    def decorator(func):
+        cache = MemoCache(max_entries, version)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            canonical = normalize(*args, **kwargs)
+            key = tuple(sorted(canonical.items()))
+            return cache.get_or_compute(key, lambda: func(**canonical))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,147 @@
+import json
+import sqlite3
+from typing import Dict, Any, Optional, List
+
+class SessionCatalog:
+    """Incrementally maintained index of session metadata for the session picker
+
+    Rows hold id, created_at, last_active, message count and hiring roles, with
+    indexes on every sortable column so that a page of sessions is a bounded
+    index scan however many sessions exist. The catalog never commits on its own:
+    the owning backend commits together with the session write it describes.
+    """
+
+    SORT_COLUMNS = ("last_active", "created_at", "message_count", "session_id")
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS session_catalog (
+        session_id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        last_active TEXT NOT NULL,
+        message_count INTEGER NOT NULL DEFAULT 0,
+        roles TEXT NOT NULL DEFAULT '[]'
+    );
+    CREATE INDEX IF NOT EXISTS idx_catalog_last_active ON session_catalog (last_active);
+    CREATE INDEX IF NOT EXISTS idx_catalog_created_at ON session_catalog (created_at);
+    CREATE INDEX IF NOT EXISTS idx_catalog_message_count ON session_catalog (message_count);
+    CREATE TABLE IF NOT EXISTS session_roles (
+        role TEXT NOT NULL,
+        session_id TEXT NOT NULL,
+        PRIMARY KEY (role, session_id)
+    );
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._conn.executescript(self.SCHEMA)
+
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM session_catalog LIMIT 1").fetchone() is None
+
+    def add_session(self, session_id: str, created_at: str) -> None:
+        """Register a new session"""
+        self._conn.execute(
+            "INSERT OR IGNORE INTO session_catalog (session_id, created_at, last_active) VALUES (?, ?, ?)",
+            (session_id, created_at, created_at)
+        )
+
+    def record_activity(self, session_id: str, last_active: Optional[str] = None,
+                        message_delta: int = 0, message_count: Optional[int] = None,
+                        roles: Optional[List[str]] = None) -> None:
+        """Apply an incremental update for a session"""
+        if message_count is not None:
+            self._conn.execute(
+                "UPDATE session_catalog SET message_count = ? WHERE session_id = ?",
+                (message_count, session_id)
+            )
+        elif message_delta:
+            self._conn.execute(
+                "UPDATE session_catalog SET message_count = message_count + ? WHERE session_id = ?",
+                (message_delta, session_id)
+            )
+        if last_active:
+            self._conn.execute(
+                "UPDATE session_catalog SET last_active = MAX(last_active, ?) WHERE session_id = ?",
+                (last_active, session_id)
+            )
+        if roles is not None:
+            roles = sorted(set(roles))
+            self._conn.execute(
+                "UPDATE session_catalog SET roles = ? WHERE session_id = ?",
+                (json.dumps(roles), session_id)
+            )
+            self._conn.execute("DELETE FROM session_roles WHERE session_id = ?", (session_id,))
+            self._conn.executemany(
+                "INSERT INTO session_roles (role, session_id) VALUES (?, ?)",
+                [(role, session_id) for role in roles]
+            )
+
+    def record_entries(self, session_id: str, entries: List[Dict[str, Any]]) -> None:
+        """Derive catalog updates from a batch of session journal entries"""
+        message_delta = 0
+        message_count = None
+        last_active = None
+        roles = None
+        for entry in entries:
+            key, value = entry["key"], entry["value"]
+            if key == "conversation_history":
+                if entry["op"] == "append":
+                    message_delta += 1
+                    last_active = value.get("timestamp") or last_active
+                else:
+                    message_count, message_delta = len(value or []), 0
+                    if value:
+                        last_active = value[-1].get("timestamp") or last_active
+            elif key == "hiring_needs" and entry["op"] == "set" and isinstance(value, dict):
+                roles = list(value.get("roles") or [])
+
+        if message_count is not None:
+            message_count += message_delta
+        self.record_activity(session_id, last_active=last_active, message_delta=message_delta,
+                             message_count=message_count, roles=roles)
+
+    def record_state(self, state: Dict[str, Any]) -> None:
+        """(Re)index a session from its full state"""
+        history = state.get("conversation_history") or []
+        created_at = state.get("created_at", "")
+        self.add_session(state["session_id"], created_at)
+        self.record_activity(
+            state["session_id"],
+            last_active=history[-1].get("timestamp") if history else created_at,
+            message_count=len(history),
+            roles=list((state.get("hiring_needs") or {}).get("roles") or [])
+        )
+
+    def query(self, offset: int = 0, limit: int = 20, sort_by: str = "last_active",
+              descending: bool = True, role: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return one page of sessions, sorted and optionally filtered by role"""
+        if sort_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort sessions by {sort_by}")
+        order = "DESC" if descending else "ASC"
+
+        sql = "SELECT c.session_id, c.created_at, c.last_active, c.message_count, c.roles FROM session_catalog c"
+        params: List[Any] = []
+        if role:
+            sql += " JOIN session_roles r ON r.session_id = c.session_id WHERE r.role = ?"
+            params.append(role)
+        sql += f" ORDER BY c.{sort_by} {order}, c.session_id {order} LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        return [
+            {
+                "session_id": session_id,
+                "created_at": created_at,
+                "last_active": last_active,
+                "message_count": message_count,
+                "roles": json.loads(roles)
+            }
+            for session_id, created_at, last_active, message_count, roles in self._conn.execute(sql, params)
+        ]
+
+    def count(self, role: Optional[str] = None) -> int:
+        """Count sessions, optionally only those hiring for a role"""
+        if role:
+            row = self._conn.execute("SELECT COUNT(*) FROM session_roles WHERE role = ?", (role,)).fetchone()
+        else:
+            row = self._conn.execute("SELECT COUNT(*) FROM session_catalog").fetchone()
+        return row[0]
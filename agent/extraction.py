@@ -0,0 +1,231 @@
+import math
+import re
+from typing import Dict, List, Any, Optional
+
+# Nouns that end a role title; up to two modifier words may precede them
+ROLE_NOUNS = (
+    "engineer", "developer", "programmer", "designer", "intern", "scientist", "analyst",
+    "architect", "researcher", "recruiter", "marketer", "manager", "writer", "specialist",
+    "consultant", "director", "administrator", "accountant", "coordinator", "strategist",
+    "technician", "tester", "associate", "representative", "co-founder", "cofounder", "cto"
+)
+
+# Words that never start a role title ("hire a", "for the", "we need")
+ROLE_STOPWORDS = (
+    "a", "an", "the", "and", "or", "for", "of", "to", "as", "our", "my", "your", "their", "this",
+    "that", "hire", "hiring", "need", "needs", "want", "looking", "with", "who", "is", "are", "be",
+    "i", "we", "you", "they", "one", "two", "some", "new", "good", "great", "strong", "experienced",
+    "talented", "first", "also", "plus", "both", "each", "every", "any", "in", "on", "at", "by"
+)
+
+# Words that start another detail, so a skill list running into them ends there
+SKILL_TERMINATORS = (
+    "budget", "budgets", "salary", "salaries", "pay", "compensation", "rate", "timeline", "deadline",
+    "within", "experience", "years", "year", "yrs", "start", "starting"
+)
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12
+}
+
+WEEKS_PER_MONTH = 4
+
+# Dollar amounts below this are only read as pay when marked hourly
+MIN_ANNUAL_SALARY = 1000
+
+_NUMBER = r"\d{1,2}|" + "|".join(NUMBER_WORDS)
+_RANGE = r"\s?(?:-|–|to)\s?"
+_MONEY = r"\$\s?\d[\d,]*(?:\.\d+)?(?:\s?k\b)?|(?<![\d,.])\d[\d,]*(?:\.\d+)?\s?k\b"
+_MODIFIER = r"(?!(?:%s)\b)[a-z][\w+#/.-]*" % "|".join(ROLE_STOPWORDS)
+_SKILL_END = r"\b\d|\$|\.(?:\s|$)|\b(?:%s)\b" % "|".join(SKILL_TERMINATORS)
+
+# One alternation over every detail kind, so a turn is scanned once, left to
+# right, and each attribute can be tied to the role mentioned before it.
+# Every branch starts with a literal, a word boundary or (bare "120k" amounts)
+# a lookbehind refusing to start inside a number, so each digit run is tried
+# from its first digit only and the scan stays linear.
+# It runs over lowercased text: case-insensitive matching is ~3x slower in re.
+_DETAIL_PATTERN = re.compile(
+    rf"(?P<salary>(?P<lo>{_MONEY})(?:{_RANGE}(?P<hi>\$?\s?\d[\d,]*(?:\.\d+)?(?:\s?k\b)?))?"
+    r"(?P<hourly>\s?(?:/\s?(?:hour|hr|h)\b|per\s+hour|an\s+hour|hourly))?)"
+    rf"|\b(?P<timeline>(?P<tlo>{_NUMBER})(?:{_RANGE}(?P<thi>{_NUMBER}))?[\s-]?(?P<unit>weeks?|wks?|months?)\b)"
+    rf"|\b(?P<experience>(?P<ylo>{_NUMBER})(?:{_RANGE}(?P<yhi>{_NUMBER})|\s?(?P<plus>\+))?\s?(?:years?|yrs?)\b)"
+    r"|\b(?P<entry>entry[\s-]level|new[\s-]grad(?:uate)?s?)\b"
+    r"|\b(?:skills?|experience|proficiency|proficient|knowledge|familiarity|background)"
+    rf"(?:\s?:\s?|\s+(?:in|with|like|such\s+as|including)\s+)(?P<skills>(?:(?!{_SKILL_END})[^;:!?\n])+)"
+    rf"|\b(?P<role>(?:{'|'.join(re.escape(n) for n in ROLE_NOUNS)})s?)\b"
+)
+
+# Modifier words ending right before a role noun ("senior backend" engineer);
+# searched only in a short window behind each noun rather than at every word
+_ROLE_MODIFIERS = re.compile(rf"\b(?:{_MODIFIER}\s+){{1,2}}$")
+MODIFIER_WINDOW = 64
+
+_SKILL_SEPARATOR = re.compile(r",|\s+and\s+|\s+or\s+|\s*&\s*", re.IGNORECASE)
+
+# Skill list items longer than this are prose, not skills
+MAX_SKILL_WORDS = 4
+
+# Connecting words left at the end of a skill list cut short by a number ("..., with 5 years")
+_TRAILING_CONNECTORS = re.compile(r"(?:\s+|^)(?:with|over|in|within|for|and|or|at|by|of|plus|about|around)$",
+                                  re.IGNORECASE)
+
+def _number(text: str) -> int:
+    return NUMBER_WORDS[text] if text in NUMBER_WORDS else int(text)
+
+def _amount(text: str) -> float:
+    """Dollar amount in a money token, with a trailing k meaning thousands"""
+    text = text.replace("$", "").replace(",", "").replace(" ", "")
+    return float(text[:-1]) * 1000 if text.endswith("k") else float(text)
+
+def _format_amount(value: float) -> str:
+    return f"{value:,.0f}" if value == int(value) else f"{value:,.2f}"
+
+def _normalize_role(text: str) -> str:
+    role = " ".join(text.lower().split())
+    return role[:-1] if role.endswith("s") and not role.endswith("ss") else role
+
+def _parse_salary(match) -> Optional[str]:
+    """Budget string in the "$120,000-$150,000" or "$30-40/hour" style"""
+    low = _amount(match.group("lo"))
+    high = _amount(match.group("hi")) if match.group("hi") else None
+    # Hundreds of digits overflow to inf, which is no budget
+    if not math.isfinite(low) or (high is not None and not math.isfinite(high)):
+        return None
+    # "$120-150k": the thousands marker on the upper bound applies to both
+    if high is not None and low < MIN_ANNUAL_SALARY <= high and low * 1000 <= high:
+        low *= 1000
+    if match.group("hourly"):
+        if high is not None:
+            return f"${_format_amount(low)}-{_format_amount(high)}/hour"
+        return f"${_format_amount(low)}/hour"
+    if max(low, high or 0) < MIN_ANNUAL_SALARY:
+        return None
+    if high is not None:
+        return f"${_format_amount(low)}-${_format_amount(high)}"
+    return f"${_format_amount(low)}"
+
+def _parse_timeline(match) -> int:
+    """Longest end of the timeline, in weeks"""
+    weeks = _number(match.group("thi") or match.group("tlo"))
+    return weeks * WEEKS_PER_MONTH if match.group("unit").startswith("month") else weeks
+
+def _parse_experience(match) -> str:
+    if match.group("entry"):
+        return "Entry-level"
+    if match.group("yhi"):
+        return f"{_number(match.group('ylo'))}-{_number(match.group('yhi'))} years"
+    years = _number(match.group("ylo"))
+    suffix = "+" if match.group("plus") else ""
+    return f"{years}{suffix} year{'s' if years != 1 or suffix else ''}"
+
+def _parse_skills(text: str) -> List[str]:
+    skills = []
+    for item in _SKILL_SEPARATOR.split(text):
+        item = item.strip()
+        if item.lower().startswith("and "):
+            item = item[4:]
+        while True:
+            trimmed = _TRAILING_CONNECTORS.sub("", item)
+            if trimmed == item:
+                break
+            item = trimmed.strip()
+        if item and len(item.split()) <= MAX_SKILL_WORDS and item not in skills:
+            skills.append(item)
+    return skills
+
+def extract_details(text: str) -> Dict[str, Any]:
+    """Parse role titles, budgets, experience, skills and timeline from one message
+
+    Runs a single left-to-right scan. Each budget, experience level or skill
+    list belongs to the role mentioned most recently before it; ones that come
+    before any role go to the message's first role ("a budget of $120K for an
+    engineer"), or are keyed by None when the message names no role.
+    """
+    details = {"roles": [], "skills": {}, "experience": {}, "budget": {}, "timeline": None}
+    lowered = text.lower()
+    # Skills keep their original casing when lowercasing kept the offsets intact
+    source = text if len(lowered) == len(text) else lowered
+    role = None
+    previous_end = 0
+    for match in _DETAIL_PATTERN.finditer(lowered):
+        if match.group("role"):
+            start = match.start()
+            modifiers = _ROLE_MODIFIERS.search(lowered, max(0, start - MODIFIER_WINDOW, previous_end), start)
+            role = _normalize_role(lowered[modifiers.start() if modifiers else start:match.end()])
+            if role not in details["roles"]:
+                details["roles"].append(role)
+            if len(details["roles"]) == 1:
+                for field in ("skills", "experience", "budget"):
+                    if None in details[field]:
+                        details[field][role] = details[field].pop(None)
+        elif match.group("salary"):
+            budget = _parse_salary(match)
+            if budget:
+                details["budget"][role] = budget
+        elif match.group("timeline"):
+            details["timeline"] = _parse_timeline(match)
+        elif match.group("experience") or match.group("entry"):
+            details["experience"][role] = _parse_experience(match)
+        elif match.group("skills"):
+            skills = details["skills"].setdefault(role, [])
+            skills.extend(s for s in _parse_skills(source[match.start("skills"):match.end("skills")]) if s not in skills)
+        previous_end = match.end()
+    return details
+
+def match_known_role(role: str, roles: List[str]) -> Optional[str]:
+    """The known role a title refers to, if any
+
+    A bare head noun or shorter title ("engineer", "ml engineer") refers to a
+    known role ending in the same words ("founding engineer", "senior ml
+    engineer"); when several do, to the most recently added one.
+    """
+    if role in roles:
+        return role
+    words = role.split()
+    for known in reversed(roles):
+        if known.split()[-len(words):] == words:
+            return known
+    return None
+
+def merge_details(hiring_details: Dict[str, Any], extracted: Dict[str, Any],
+                  overwrite: bool = True, add_roles: bool = True) -> bool:
+    """Fold one message's extracted details into the session's hiring details
+
+    With overwrite, new values replace earlier ones (and skills are added to
+    the role's list); without it they only fill gaps. Titles that shorten a
+    known role update that role instead of adding a new one. Details not tied
+    to a role in the message go to the most recently mentioned known role.
+    Returns whether anything changed.
+    """
+    changed = False
+    roles = hiring_details.setdefault("roles", [])
+    # Extracted title -> the session role it refers to
+    resolved = {}
+    for role in extracted["roles"]:
+        known = match_known_role(role, roles)
+        if known is None and add_roles:
+            roles.append(role)
+            changed = True
+            known = role
+        resolved[role] = known
+    fallback = roles[-1] if roles else None
+
+    for field in ("skills", "experience", "budget"):
+        current = hiring_details.setdefault(field, {})
+        for role, value in extracted[field].items():
+            role = fallback if role is None else resolved.get(role, role)
+            if role not in roles or not value:
+                continue
+            if field == "skills" and overwrite and role in current:
+                value = current[role] + [s for s in value if s not in current[role]]
+            if (overwrite or role not in current) and current.get(role) != value:
+                current[role] = value
+                changed = True
+
+    timeline = extracted["timeline"]
+    if timeline and (overwrite or not hiring_details.get("timeline")) and hiring_details.get("timeline") != timeline:
+        hiring_details["timeline"] = timeline
+        changed = True
+    return changed
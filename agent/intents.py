@@ -0,0 +1,96 @@
+import re
+from typing import Dict, List, Tuple, Iterable, Any
+
+# Phrases that route a user message straight to a tool, in priority order
+INTENT_KEYWORDS = {
+    "job_description": ("generate job description", "create job description"),
+    "hiring_plan": ("hiring plan", "checklist")
+}
+
+# Phrases that count as a request for one of the supported roles
+ROLE_KEYWORDS = {
+    "founding engineer": ("engineer",),
+    "genai intern": ("intern", "genai")
+}
+
+# Tool names as they appear in model output
+TOOL_KEYWORDS = {
+    "search_job_market": ("search_job_market",),
+    "draft_job_description": ("draft_job_description",),
+    "create_hiring_checklist": ("create_hiring_checklist",)
+}
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation for keywords, factored into a prefix trie
+
+    Branches share their common prefixes, so at each text position the engine
+    rules out most keywords on the first character instead of trying them all.
+    An optional suffix is greedy, so the longest keyword at a position wins.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+class IntentRouter:
+    """Classify text into intents, roles and tools in one regex pass
+
+    Every keyword from the tables is compiled into a single trie-shaped regex
+    that scans the lowercased text once. Keywords match as substrings, and
+    labels come back in table order, so the first intent is the highest-priority one.
+    """
+
+    KINDS = ("intents", "roles", "tools")
+
+    def __init__(self, intents: Dict[str, Iterable[str]] = INTENT_KEYWORDS,
+                 roles: Dict[str, Iterable[str]] = ROLE_KEYWORDS,
+                 tools: Dict[str, Iterable[str]] = TOOL_KEYWORDS):
+        # keyword -> (kind, label) pairs it signals
+        self._labels: Dict[str, List[Tuple[str, str]]] = {}
+        # (kind, label) -> position in its table, for stable output order
+        self._order: Dict[Tuple[str, str], int] = {}
+        for kind, table in zip(self.KINDS, (intents, roles, tools)):
+            for position, (label, keywords) in enumerate(table.items()):
+                self._order[(kind, label)] = position
+                for keyword in keywords:
+                    self._labels.setdefault(keyword.lower(), []).append((kind, label))
+
+        # Matches don't overlap, so a keyword also signals the labels of every
+        # keyword it contains. Two keywords that only share a boundary (such as
+        # "genai" and "intern" in "genaintern") count just the first one.
+        for keyword, labels in self._labels.items():
+            for other, other_labels in self._labels.items():
+                if other != keyword and other in keyword:
+                    labels.extend(pair for pair in other_labels if pair not in labels)
+
+        self._pattern = re.compile(_trie_pattern(self._labels))
+
+    def classify(self, text: str) -> Dict[str, List[str]]:
+        """Return the intents, roles and tools mentioned in text"""
+        found = set()
+        for keyword in self._pattern.findall(text.lower()):
+            found.update(self._labels[keyword])
+
+        result = {kind: [] for kind in self.KINDS}
+        for kind, label in sorted(found, key=lambda pair: self._order[pair]):
+            result[kind].append(label)
+        return result
+
+_router = IntentRouter()
+
+def classify(text: str) -> Dict[str, List[str]]:
+    """Classify text with the default keyword tables"""
+    return _router.classify(text)
@@ -0,0 +1,341 @@
+import csv
+import logging
+import mmap
+import os
+import re
+import threading
+import zipfile
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from . import PACKAGE_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+MARKET_DATA = os.path.join(PACKAGE_DATA_DIR, "market", "roles.csv")
+
+# Columns the dataset must have; skills_in_demand is a ";"-separated list
+MARKET_COLUMNS = ("role", "avg_salary", "demand", "skills_in_demand")
+SKILL_SEPARATOR = ";"
+
+# A query word found in a role title counts for more than one found in its skills
+TITLE_WEIGHT = 2.0
+SKILL_WEIGHT = 1.0
+
+# Score factor for a query word matched only within one edit of a known word
+FUZZY_WEIGHT = 0.5
+FUZZY_MIN_LENGTH = 4
+
+# Rows a posting list may add as candidates; longer lists only re-rank existing ones
+SCAN_LIMIT = 256
+
+# Rows of the rarest title word checked against the others per step
+INTERSECT_CHUNK = 1024
+
+# Words in at least 1/DENSE_FRACTION of rows also get a row bitmap for O(1) membership
+DENSE_FRACTION = 32
+
+# Built indexes are saved next to the dataset as <data file>INDEX_SUFFIX and
+# reused while the dataset's size and modification time are unchanged
+INDEX_SUFFIX = ".index.npz"
+INDEX_VERSION = 1
+
+# Query words that say what is being asked rather than which role
+QUERY_STOPWORDS = frozenset((
+    "a", "an", "the", "for", "of", "in", "on", "and", "or", "to", "with", "what", "is", "are", "how",
+    "much", "job", "jobs", "role", "roles", "market", "markets", "salary", "salaries", "trend", "trends",
+    "demand", "rate", "rates", "pay", "hiring", "position", "positions", "average", "avg", "current"
+))
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+def _deletions(word: str) -> List[str]:
+    return [word[:i] + word[i + 1:] for i in range(len(word))]
+
+def _pack(words: List[str]) -> np.ndarray:
+    """Newline-joined UTF-8 bytes, far smaller on disk than a padded string array"""
+    return np.frombuffer("\n".join(words).encode("utf-8"), dtype=np.uint8)
+
+def _unpack(data: np.ndarray) -> List[str]:
+    return data.tobytes().decode("utf-8").split("\n") if len(data) else []
+
+def _contains(postings: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Boolean mask of which rows appear in a sorted posting array"""
+    positions = np.searchsorted(postings, rows).clip(max=len(postings) - 1)
+    return postings[positions] == rows
+
+class MarketIndex:
+    """Inverted index over a job-market CSV, read through a memory map
+
+    Only byte offsets, posting arrays and bitmaps for the most frequent words
+    live in memory: each row is decoded from the map when it is returned. Rows are numbered shortest title first,
+    so sorted postings are also in tie-break order and any prefix of a
+    posting (or of an intersection of postings) holds the most specific
+    titles. Words missing from the vocabulary match known words one edit
+    away through a table of single-character deletions. The built index is
+    saved next to the dataset, so only the first process to see a version of
+    the file parses it.
+    """
+
+    def __init__(self, path: str = MARKET_DATA):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._map = None
+        self._columns: Dict[str, int] = {}
+        # (start, end) byte range of each row, by row id
+        self._spans = np.empty((0, 2), dtype=np.int64)
+        # (field, word) -> sorted row ids containing the word in that field
+        self._postings: Dict[Tuple[str, str], np.ndarray] = {}
+        # Row bitmaps for the most frequent (field, word) keys
+        self._masks: Dict[Tuple[str, str], np.ndarray] = {}
+        # single-character deletion -> vocabulary words it came from
+        self._deletes: Dict[str, Tuple[str, ...]] = {}
+        self._vocabulary = set()
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._spans)
+
+    def _load(self) -> None:
+        """Map the file and index it, once"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                # mmap rejects empty files, which then fail the header check below
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+            source = np.array([INDEX_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+            if not self._read_index(source):
+                self._build(stat.st_size)
+                self._write_index(source)
+            self._finish()
+            self._loaded = True
+
+    def preload(self) -> Optional[threading.Thread]:
+        """Build or read the index on a background thread, off the first search"""
+        if self._loaded:
+            return None
+        thread = threading.Thread(target=self._preload, name="market-index", daemon=True)
+        thread.start()
+        return thread
+
+    def _preload(self) -> None:
+        try:
+            self._load()
+        except Exception:
+            # The first search retries and raises in the caller
+            logger.warning("Preloading market index %s failed", self.path, exc_info=True)
+
+    def _read_index(self, source: np.ndarray) -> bool:
+        """Restore a saved index built from this version of the file, if there is one"""
+        try:
+            with np.load(self.path + INDEX_SUFFIX, allow_pickle=False) as saved:
+                if not np.array_equal(saved["source"], source):
+                    return False
+                self._columns = dict(zip(MARKET_COLUMNS, saved["columns"].tolist()))
+                self._spans = saved["spans"]
+                keys, offsets, rows = saved["keys"], saved["offsets"], saved["rows"]
+                variants, variant_offsets, variant_words = (
+                    saved["variants"], saved["variant_offsets"], saved["variant_words"])
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            logger.warning("Ignoring unreadable market index %s", self.path + INDEX_SUFFIX, exc_info=True)
+            return False
+        self._postings = {tuple(key.split("\t", 1)): rows[start:end]
+                          for key, start, end in zip(_unpack(keys), offsets[:-1].tolist(), offsets[1:].tolist())}
+        words = _unpack(variant_words)
+        self._deletes = {variant: tuple(words[start:end]) for variant, start, end in
+                         zip(_unpack(variants), variant_offsets[:-1].tolist(), variant_offsets[1:].tolist())}
+        return True
+
+    def _write_index(self, source: np.ndarray) -> None:
+        """Save the built index next to the file; skipped where that is not writable"""
+        lengths = [len(rows) for rows in self._postings.values()]
+        variant_lengths = [len(found) for found in self._deletes.values()]
+        tmp_file = f"{self.path}{INDEX_SUFFIX}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                np.savez(
+                    f,
+                    source=source,
+                    columns=np.array([self._columns[c] for c in MARKET_COLUMNS], dtype=np.int64),
+                    spans=self._spans,
+                    keys=_pack(["\t".join(key) for key in self._postings]),
+                    offsets=np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+                    rows=np.concatenate(list(self._postings.values()) or [np.empty(0, dtype=np.int32)]),
+                    variants=_pack(list(self._deletes)),
+                    variant_offsets=np.concatenate([[0], np.cumsum(variant_lengths, dtype=np.int64)]),
+                    variant_words=_pack([word for found in self._deletes.values() for word in found])
+                )
+            os.replace(tmp_file, self.path + INDEX_SUFFIX)
+        except OSError:
+            logger.info("Could not save market index next to %s", self.path, exc_info=True)
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _build(self, size: int) -> None:
+        data = self._map
+        end = data.find(b"\n") + 1 or size
+        header = next(csv.reader([data[:end].decode("utf-8-sig")]), [])
+        missing = [c for c in MARKET_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"Market data {self.path} is missing columns: {', '.join(missing)}")
+        self._columns = {c: header.index(c) for c in MARKET_COLUMNS}
+        role_column = self._columns["role"]
+        skills_column = self._columns["skills_in_demand"]
+
+        # Per row: byte range, (title word count, file order) and indexed words
+        spans, sort_keys, words = [], [], []
+        pos = end
+        while pos < size:
+            end = data.find(b"\n", pos) + 1 or size
+            line = data[pos:end].decode("utf-8").rstrip("\r\n")
+            if line:
+                fields = next(csv.reader([line]))
+                title = tokenize(fields[role_column])
+                sort_keys.append((len(title), len(spans)))
+                spans.append((pos, end))
+                words.append((set(title), set(tokenize(fields[skills_column]))))
+            pos = end
+
+        # Renumber rows so row id order is tie-break order
+        order = [row for _, row in sorted(sort_keys)]
+        self._spans = np.array([spans[row] for row in order], dtype=np.int64).reshape(-1, 2)
+        postings = defaultdict(list)
+        for row_id, row in enumerate(order):
+            title, skills = words[row]
+            for word in title:
+                postings[("title", word)].append(row_id)
+            for word in skills:
+                postings[("skill", word)].append(row_id)
+        self._postings = {key: np.array(rows, dtype=np.int32) for key, rows in postings.items()}
+
+        deletes = defaultdict(set)
+        for word in {word for _, word in self._postings}:
+            if len(word) >= FUZZY_MIN_LENGTH - 1:
+                for variant in _deletions(word):
+                    deletes[variant].add(word)
+        self._deletes = {variant: tuple(sorted(found)) for variant, found in deletes.items()}
+
+    def _finish(self) -> None:
+        """Derive the vocabulary and dense bitmaps from the postings"""
+        count = len(self._spans)
+        self._masks = {}
+        for key, rows in self._postings.items():
+            if len(rows) * DENSE_FRACTION >= count:
+                mask = self._masks[key] = np.zeros(count, dtype=bool)
+                mask[rows] = True
+        self._vocabulary = {word for _, word in self._postings}
+
+    def _matches(self, word: str) -> List[Tuple[str, float]]:
+        """Vocabulary words a query word stands for, with their score factors"""
+        if word in self._vocabulary:
+            return [(word, 1.0)]
+        if len(word) < FUZZY_MIN_LENGTH:
+            return []
+        # One insertion, deletion, substitution or adjacent transposition away
+        found = set(self._deletes.get(word, ()))
+        for variant in _deletions(word):
+            if variant in self._vocabulary:
+                found.add(variant)
+            found.update(self._deletes.get(variant, ()))
+        return [(match, FUZZY_WEIGHT) for match in sorted(found)]
+
+    def _has(self, key: Tuple[str, str], rows: np.ndarray) -> np.ndarray:
+        """Boolean mask of which rows contain a (field, word) key"""
+        mask = self._masks.get(key)
+        return mask[rows] if mask is not None else _contains(self._postings[key], rows)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Decode one row from the mapped file"""
+        self._load()
+        start, end = self._spans[row]
+        fields = next(csv.reader([self._map[start:end].decode("utf-8").rstrip("\r\n")]))
+        record = {column: fields[index] for column, index in self._columns.items()}
+        record["skills_in_demand"] = [s.strip() for s in record["skills_in_demand"].split(SKILL_SEPARATOR) if s.strip()]
+        return record
+
+    def search(self, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """Best-matching rows for a free-text query, best first
+
+        A row scores TITLE_WEIGHT or SKILL_WEIGHT per query word found in its
+        title or skills, scaled by FUZZY_WEIGHT for near misses; ties go to
+        the shorter title, then to the earlier row. Rows whose titles hold
+        every title word of the query are the candidates when there are any;
+        otherwise the rarest word's rows are.
+        """
+        self._load()
+        # (row count, weight, key) per matched word and field
+        lists = []
+        # Per query word found in some title, its title keys (several for near misses)
+        title_keys = []
+        for word in dict.fromkeys(tokenize(query)):
+            if word in QUERY_STOPWORDS:
+                continue
+            keys = []
+            for match, factor in self._matches(word):
+                for field, weight in (("title", TITLE_WEIGHT), ("skill", SKILL_WEIGHT)):
+                    key = (field, match)
+                    if key in self._postings:
+                        lists.append((len(self._postings[key]), weight * factor, key))
+                        if field == "title":
+                            keys.append(key)
+            if keys:
+                title_keys.append(keys)
+        if not lists:
+            return []
+        lists.sort()
+
+        candidates = np.empty(0, dtype=np.int32)
+        if len(title_keys) > 1:
+            # Intersect in chunks of the rarest word's rows; ids are in tie-break
+            # order, so the walk stops as soon as enough candidates are found
+            title_keys.sort(key=lambda keys: sum(len(self._postings[key]) for key in keys))
+            rarest = title_keys[0]
+            rows = self._postings[rarest[0]] if len(rarest) == 1 else np.unique(
+                np.concatenate([self._postings[key] for key in rarest]))
+            found, count = [candidates], 0
+            for start in range(0, len(rows), INTERSECT_CHUNK):
+                chunk = rows[start:start + INTERSECT_CHUNK]
+                for keys in title_keys[1:]:
+                    present = self._has(keys[0], chunk)
+                    for key in keys[1:]:
+                        present |= self._has(key, chunk)
+                    chunk = chunk[present]
+                found.append(chunk)
+                count += len(chunk)
+                if count >= SCAN_LIMIT:
+                    break
+            candidates = np.concatenate(found)[:SCAN_LIMIT]
+        if len(candidates) < limit:
+            candidates = np.unique(np.concatenate(
+                [candidates, self._postings[lists[0][2]][:SCAN_LIMIT]] +
+                [self._postings[key] for count, _, key in lists[1:] if count <= SCAN_LIMIT]))
+
+        scores = np.zeros(len(candidates))
+        for _, weight, key in lists:
+            scores += weight * self._has(key, candidates)
+        best = np.lexsort((candidates, -scores))[:limit]
+        return [self.row(int(candidates[i])) for i in best]
+
+_indexes: Dict[str, MarketIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_market_index(path: Optional[str] = None) -> MarketIndex:
+    """Return the shared index for a dataset (HR_AGENT_MARKET_DATA or the shipped data/market/roles.csv)"""
+    path = path or os.getenv("HR_AGENT_MARKET_DATA", MARKET_DATA)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = MarketIndex(path)
+        return index
@@ -1,21 +1,92 @@
-import json
-import os
+import atexit
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+from .storage import StorageBackend, get_storage_backend
+# Re-exported for callers that import it alongside SessionMemory
+from .analytics import AnalyticsTracker
+
+logger = logging.getLogger(__name__)
+
+# Write-behind memories, flushed by a shared background thread and at exit
+_write_behind_memories = weakref.WeakSet()
+_flusher_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+_FLUSH_TICK_SECONDS = 0.25
+
+# Sessions nobody holds any more that stay loaded, most recently released last
+MAX_IDLE_SESSIONS = 32
+
+def _flush_loop() -> None:
+    """Flush write-behind memories whose oldest buffered entry is past due"""
+    while True:
+        time.sleep(_FLUSH_TICK_SECONDS)
+        for memory in list(_write_behind_memories):
+            # One failing session must not stop time-based flushing for the rest;
+            # its batch stays buffered and is retried on the next tick
+            try:
+                memory._flush_if_due()
+            except Exception:
+                logger.exception("Write-behind flush failed for session %s", memory.session_id)
+
+def _register_write_behind(memory: "SessionMemory") -> None:
+    """Track a write-behind memory and make sure the flusher thread is running"""
+    global _flusher
+    _write_behind_memories.add(memory)
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="session-memory-flusher", daemon=True)
+            _flusher.start()
+
+@atexit.register
+def _flush_write_behind_memories() -> None:
+    """Flush every write-behind memory before the interpreter exits"""
+    for memory in list(_write_behind_memories):
+        try:
+            memory.flush()
+        except Exception:
+            logger.exception("Write-behind flush failed for session %s", memory.session_id)
 
 class SessionMemory:
-    def __init__(self, session_id: Optional[str] = None):
+    def __init__(self, session_id: Optional[str] = None, write_behind: bool = False,
+                 flush_interval: float = 2.0, max_pending: int = 64, durability: str = "buffered",
+                 backend: Optional[StorageBackend] = None):
+        """
+        With write_behind=True, mutations are buffered and flushed together once
+        max_pending entries or flush_interval seconds accumulate, on flush() (the
+        agent calls it at the end of each turn) and at interpreter exit.
+        durability="fsync" asks the backend to sync every write to disk.
+        """
+        if durability not in ("buffered", "fsync"):
+            raise ValueError(f"Unknown durability mode: {durability}")
         self.session_id = session_id or f"session_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        self.data_dir = os.path.join("data", "session_data")
-        os.makedirs(self.data_dir, exist_ok=True)
-        self.memory_file = os.path.join(self.data_dir, f"{self.session_id}.json")
+        self.backend = backend or get_storage_backend()
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.durability = durability
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_since = 0.0
+        self._lock = threading.RLock()
         self.state = self._load_or_create_state()
+        if write_behind:
+            _register_write_behind(self)
+    
+    @property
+    def io_stats(self) -> Dict[str, int]:
+        """Write/fsync/snapshot counters of the underlying backend"""
+        return self.backend.io_stats
     
     def _load_or_create_state(self) -> Dict[str, Any]:
         """Load existing state or create a new one"""
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, 'r') as f:
-                return json.load(f)
+        state = self.backend.load_session(self.session_id)
+        if state is not None:
+            return state
         else:
             # Initialize with empty state
             initial_state = {
@@ -27,18 +98,68 @@ class SessionMemory:
                 "hiring_checklists": {},
                 "user_info": {}
             }
-            self._save_state(initial_state)
+            self.backend.create_session(self.session_id, initial_state, durable=self.durability == "fsync")
             return initial_state
     
-    def _save_state(self, state: Dict[str, Any]) -> None:
-        """Save state to file"""
-        with open(self.memory_file, 'w') as f:
-            json.dump(state, f, indent=2)
+    def _journal(self, op: str, key: str, value: Any, field: Optional[str] = None) -> None:
+        """Record a mutation, either writing it through or queueing it for write-behind"""
+        with self._lock:
+            entry = {"op": op, "key": key, "value": value}
+            if field is not None:
+                entry["field"] = field
+            
+            if not self.write_behind:
+                self._write_entries([entry])
+                return
+            
+            if op == "set":
+                # A whole-key overwrite supersedes anything still queued for that key
+                self._pending = [e for e in self._pending if e["key"] != key]
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(entry)
+            
+            if len(self._pending) >= self.max_pending:
+                self.flush()
+    
+    def _write_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Hand a batch of entries to the backend"""
+        self.backend.append_entries(self.session_id, entries, self.state,
+                                    durable=self.durability == "fsync")
+    
+    def flush(self) -> None:
+        """Write any buffered write-behind entries to the backend
+
+        The batch is only dropped once the backend accepted it; if the write
+        raises, the entries stay buffered for the next flush.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            entries = self._pending
+            self._write_entries(entries)
+            self._pending = []
+    
+    def _flush_if_due(self) -> None:
+        """Flush if buffered entries have waited longer than flush_interval"""
+        with self._lock:
+            if self._pending and time.monotonic() - self._pending_since >= self.flush_interval:
+                self.flush()
+    
+    def compact(self) -> None:
+        """Ask the backend to fold this session's log into a fresh snapshot"""
+        with self._lock:
+            # Buffered entries are part of self.state, so the snapshot covers them
+            self._pending = []
+            self.backend.compact(self.session_id, self.state, durable=self.durability == "fsync")
     
     def update(self, key: str, value: Any) -> None:
         """Update a specific key in the state"""
-        self.state[key] = value
-        self._save_state(self.state)
+        # State change and journal entry happen under one lock, so a flush or
+        # compaction on another thread never sees one without the other
+        with self._lock:
+            self.state[key] = value
+            self._journal("set", key, value)
     
     def get(self, key: str) -> Any:
         """Get a value from the state"""
@@ -46,149 +167,119 @@ class SessionMemory:
     
     def add_to_conversation(self, role: str, content: str) -> None:
         """Add a message to the conversation history"""
-        if "conversation_history" not in self.state:
-            self.state["conversation_history"] = []
-        
-        self.state["conversation_history"].append({
+        message = {
             "role": role,
             "content": content,
             "timestamp": datetime.now().isoformat()
-        })
-        self._save_state(self.state)
+        }
+        with self._lock:
+            self.state.setdefault("conversation_history", []).append(message)
+            self._journal("append", "conversation_history", message)
     
     def add_hiring_need(self, role: str, details: Dict[str, Any]) -> None:
         """Add or update hiring need"""
-        if "hiring_needs" not in self.state:
-            self.state["hiring_needs"] = {}
-        
-        self.state["hiring_needs"][role] = details
-        self._save_state(self.state)
+        self._set_item("hiring_needs", role, details)
     
     def add_job_description(self, role: str, description: str) -> None:
         """Add a job description"""
-        if "job_descriptions" not in self.state:
-            self.state["job_descriptions"] = {}
-        
-        self.state["job_descriptions"][role] = description
-        self._save_state(self.state)
+        self._set_item("job_descriptions", role, description)
     
     def add_hiring_checklist(self, role: str, checklist: Dict[str, Any]) -> None:
         """Add a hiring checklist"""
-        if "hiring_checklists" not in self.state:
-            self.state["hiring_checklists"] = {}
-        
-        self.state["hiring_checklists"][role] = checklist
-        self._save_state(self.state)
+        self._set_item("hiring_checklists", role, checklist)
+    
+    def _set_item(self, key: str, field: str, value: Any) -> None:
+        with self._lock:
+            self.state.setdefault(key, {})[field] = value
+            self._journal("set_item", key, value, field=field)
     
     def get_full_state(self) -> Dict[str, Any]:
         """Get the complete state"""
         return self.state
 
-class AnalyticsTracker:
-    def __init__(self, session_id: str):
-        self.session_id = session_id
-        self.analytics_dir = os.path.join("data", "analytics")
-        os.makedirs(self.analytics_dir, exist_ok=True)
-        self.analytics_file = os.path.join(self.analytics_dir, "usage_stats.json")
-        self.session_started = datetime.now()
-        self._track_session_start()
-    
-    def _load_analytics(self) -> Dict[str, Any]:
-        """Load existing analytics or create new"""
-        if os.path.exists(self.analytics_file):
-            with open(self.analytics_file, 'r') as f:
-                return json.load(f)
-        else:
-            return {"sessions": [], "tool_usage": {}, "role_requests": {}}
-    
-    def _save_analytics(self, data: Dict[str, Any]) -> None:
-        """Save analytics data"""
-        with open(self.analytics_file, 'w') as f:
-            json.dump(data, f, indent=2)
-    
-    def _track_session_start(self) -> None:
-        """Track a new session"""
-        analytics = self._load_analytics()
-        
-        # Check if this session already exists
-        for session in analytics["sessions"]:
-            if session["session_id"] == self.session_id:
-                # Update existing session
-                session["last_active"] = self.session_started.isoformat()
-                self._save_analytics(analytics)
+class MemoryRegistry:
+    """One shared SessionMemory per (storage backend, session id) in the process
+
+    acquire() hands out the loaded instance, loading it on first use, and
+    counts references; release() drops one, and lease() drops it once its
+    owner goes away. A memory nobody holds is flushed
+    and kept as idle, so reopening a recent session skips the load, and the
+    least recently released idle memories beyond max_idle are dropped. Options
+    such as write_behind apply when a session is first loaded.
+    """
+
+    def __init__(self, max_idle: int = MAX_IDLE_SESSIONS):
+        self.max_idle = max_idle
+        self._active: Dict[Tuple[StorageBackend, str], SessionMemory] = {}
+        self._refs: Dict[Tuple[StorageBackend, str], int] = {}
+        self._idle: "OrderedDict[Tuple[StorageBackend, str], SessionMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def acquire(self, session_id: Optional[str] = None, **options: Any) -> SessionMemory:
+        """Return the session's shared memory and take a reference to it"""
+        backend = options.pop("backend", None) or get_storage_backend()
+        with self._lock:
+            key = (backend, session_id)
+            memory = self._active.get(key) or self._idle.pop(key, None)
+            if memory is None:
+                # Loaded under the lock so concurrent first opens read the session once
+                memory = SessionMemory(session_id, backend=backend, **options)
+                key = (backend, memory.session_id)
+                self.loads += 1
+            else:
+                self.hits += 1
+            self._active[key] = memory
+            self._refs[key] = self._refs.get(key, 0) + 1
+            return memory
+
+    def release(self, memory: SessionMemory) -> None:
+        """Drop one reference; memories this registry did not hand out are ignored"""
+        key = (memory.backend, memory.session_id)
+        with self._lock:
+            if self._active.get(key) is not memory:
                 return
-        
-        # Add new session
-        session_data = {
-            "session_id": self.session_id,
-            "start_time": self.session_started.isoformat(),
-            "last_active": self.session_started.isoformat(),
-            "duration_seconds": 0,
-            "messages_count": 0,
-            "tools_used": []
-        }
-        
-        analytics["sessions"].append(session_data)
-        self._save_analytics(analytics)
-    
-    def track_message(self, role: str, content: str) -> None:
-        """Track a message in the conversation"""
-        analytics = self._load_analytics()
-        
-        # Find this session
-        for session in analytics["sessions"]:
-            if session["session_id"] == self.session_id:
-                session["messages_count"] += 1
-                session["last_active"] = datetime.now().isoformat()
-                # Update duration
-                start_time = datetime.fromisoformat(session["start_time"])
-                session["duration_seconds"] = (datetime.now() - start_time).total_seconds()
-                break
-        
-        self._save_analytics(analytics)
-    
-    def track_tool_usage(self, tool_name: str) -> None:
-        """Track tool usage"""
-        analytics = self._load_analytics()
-        
-        # Update tool usage
-        if tool_name not in analytics["tool_usage"]:
-            analytics["tool_usage"][tool_name] = 0
-        
-        analytics["tool_usage"][tool_name] += 1
-        
-        # Also add to this session's tools used
-        for session in analytics["sessions"]:
-            if session["session_id"] == self.session_id:
-                if "tools_used" not in session:
-                    session["tools_used"] = []
-                if tool_name not in session["tools_used"]:
-                    session["tools_used"].append(tool_name)
-                break
-        
-        self._save_analytics(analytics)
-    
-    def track_role_request(self, role: str) -> None:
-        """Track which roles are being requested"""
-        analytics = self._load_analytics()
-        
-        # Update role requests
-        if role not in analytics["role_requests"]:
-            analytics["role_requests"][role] = 0
-        
-        analytics["role_requests"][role] += 1
-        self._save_analytics(analytics)
-    
-    def get_usage_stats(self) -> Dict[str, Any]:
-        """Get usage statistics for display"""
-        analytics = self._load_analytics()
-        
-        # Compile stats
-        stats = {
-            "total_sessions": len(analytics["sessions"]),
-            "avg_session_duration": sum(s.get("duration_seconds", 0) for s in analytics["sessions"]) / max(1, len(analytics["sessions"])),
-            "most_requested_role": max(analytics["role_requests"].items(), key=lambda x: x[1])[0] if analytics["role_requests"] else None,
-            "top_tools": sorted(analytics["tool_usage"].items(), key=lambda x: x[1], reverse=True)[:3]
-        }
-        
-        return stats
\ No newline at end of file
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            del self._refs[key]
+            del self._active[key]
+            self._idle[key] = memory
+            while len(self._idle) > self.max_idle:
+                self._idle.popitem(last=False)
+                self.evictions += 1
+        memory.flush()
+
+    def lease(self, owner: Any, memory: SessionMemory) -> weakref.finalize:
+        """Tie one acquired reference to owner's lifetime
+
+        The reference is released when the returned finalizer is called or
+        when owner is garbage collected (a Streamlit session that simply
+        ends), whichever comes first, and never twice.
+        """
+        return weakref.finalize(owner, self.release, memory)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "active": len(self._active),
+                "idle": len(self._idle),
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions
+            }
+
+_registry = MemoryRegistry()
+
+def get_memory_registry() -> MemoryRegistry:
+    """Return the process-wide session memory registry"""
+    return _registry
+
+def acquire_session_memory(session_id: Optional[str] = None, **options: Any) -> SessionMemory:
+    """Shared SessionMemory for a session id; pair with release_session_memory()"""
+    return _registry.acquire(session_id, **options)
+
+def release_session_memory(memory: SessionMemory) -> None:
+    _registry.release(memory)
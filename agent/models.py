@@ -0,0 +1,103 @@
+import asyncio
+import random
+import re
+import time
+from typing import Any, Iterator, AsyncIterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+# Words with their trailing whitespace: the unit a fake "token" streams in
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+DEFAULT_FAKE_RESPONSE = (
+    "Thanks for the details about {input}. To plan this hire, could you share the key skills, "
+    "the experience level you are targeting, your budget range and your ideal timeline?"
+)
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic offline chat model for load and latency testing
+
+    Replies cycle through `responses`, or fill `template` with the latest human
+    message as {input}. Each call waits a first-token latency drawn from
+    N(latency_mean, latency_stddev), then emits words at a rate drawn from
+    N(tokens_per_second, tokens_per_second_stddev). All draws come from a
+    seeded RNG, so a run is reproducible. Streaming is supported sync and async.
+    """
+
+    responses: List[str] = []
+    template: str = DEFAULT_FAKE_RESPONSE
+    latency_mean: float = 0.3
+    latency_stddev: float = 0.05
+    tokens_per_second: float = 60.0
+    tokens_per_second_stddev: float = 10.0
+    seed: int = 0
+
+    _rng: random.Random = PrivateAttr()
+    _calls: int = PrivateAttr(default=0)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def _next_reply(self, messages: List[BaseMessage]) -> str:
+        """Pick the scripted reply for this call"""
+        self._calls += 1
+        if self.responses:
+            return self.responses[(self._calls - 1) % len(self.responses)]
+        latest_input = next((m.content for m in reversed(messages) if m.type == "human"), "")
+        return self.template.format(input=latest_input)
+
+    def _timings(self, text: str):
+        """Draw the first-token latency and per-token delay for one reply"""
+        latency = max(0.0, self._rng.gauss(self.latency_mean, self.latency_stddev))
+        rate = max(1.0, self._rng.gauss(self.tokens_per_second, self.tokens_per_second_stddev))
+        return latency, 1.0 / rate
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        text = self._next_reply(messages)
+        latency, token_delay = self._timings(text)
+        time.sleep(latency + token_delay * len(_TOKEN_PATTERN.findall(text)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        text = self._next_reply(messages)
+        latency, token_delay = self._timings(text)
+        await asyncio.sleep(latency + token_delay * len(_TOKEN_PATTERN.findall(text)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text = self._next_reply(messages)
+        latency, token_delay = self._timings(text)
+        time.sleep(latency)
+        for index, token in enumerate(_TOKEN_PATTERN.findall(text)):
+            if index:
+                time.sleep(token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text = self._next_reply(messages)
+        latency, token_delay = self._timings(text)
+        await asyncio.sleep(latency)
+        for index, token in enumerate(_TOKEN_PATTERN.findall(text)):
+            if index:
+                await asyncio.sleep(token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Callable, Tuple
+
+# Worker threads shared by every agent for per-role generation
+ROLE_WORKERS = int(os.getenv("HR_AGENT_ROLE_WORKERS", "8"))
+
+# Seconds one role may run before its result is given up on
+ROLE_TIMEOUT_SECONDS = float(os.getenv("HR_AGENT_ROLE_TIMEOUT", "30"))
+
+# Seconds from submission after which every role still unfinished is given up on,
+# including roles still queued behind workers held by timed-out calls
+ROLE_DEADLINE_SECONDS = float(os.getenv("HR_AGENT_ROLE_DEADLINE", "60"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_role_executor() -> ThreadPoolExecutor:
+    """Return the process-wide bounded pool for per-role work"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ROLE_WORKERS, thread_name_prefix="hr-agent-role")
+        return _executor
+
+def run_per_role(roles: List[str], generate: Callable[[str], Any],
+                 timeout: float = ROLE_TIMEOUT_SECONDS,
+                 executor: ThreadPoolExecutor = None,
+                 deadline: float = ROLE_DEADLINE_SECONDS) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """Run generate(role) for every role concurrently on a bounded pool
+
+    Returns (results, errors), both ordered like `roles`. Each role's timeout
+    counts from when a worker starts it, so roles queued behind a busy pool
+    are not penalized; the overall deadline counts from submission and bounds
+    the whole call, cancelling roles that never got a worker. A role that
+    raises or times out lands in errors while the others still return; a
+    timed-out call keeps its worker until it finishes, but its result is discarded.
+    """
+    executor = executor or get_role_executor()
+    started: Dict[str, float] = {}
+    give_up_at = time.monotonic() + max(deadline, timeout)
+
+    def run(role):
+        started[role] = time.monotonic()
+        return generate(role)
+
+    futures = {executor.submit(run, role): role for role in roles}
+    outcomes: Dict[str, Any] = {}
+    failures: Dict[str, Exception] = {}
+    pending = set(futures)
+    while pending:
+        # Sleep until the next result, a running role's timeout or the overall deadline
+        deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+        wait_for = max(0.0, min(deadlines + [give_up_at]) - time.monotonic())
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            role = futures[future]
+            try:
+                outcomes[role] = future.result()
+            except Exception as e:
+                failures[role] = e
+
+        now = time.monotonic()
+        for future in list(pending):
+            role = futures[future]
+            if role in started and now - started[role] >= timeout:
+                pending.discard(future)
+                failures[role] = TimeoutError(f"Generation for {role!r} took longer than {timeout:g}s")
+
+        if pending and now >= give_up_at:
+            for future in pending:
+                future.cancel()
+                failures[futures[future]] = TimeoutError(
+                    f"Generation for {futures[future]!r} did not finish within {max(deadline, timeout):g}s")
+            pending = set()
+
+    results = {role: outcomes[role] for role in roles if role in outcomes}
+    errors = {role: failures[role] for role in roles if role in failures}
+    return results, errors
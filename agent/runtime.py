@@ -0,0 +1,115 @@
+import os
+import threading
+from typing import Dict, Tuple, Callable, Any
+
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.output_parsers import StrOutputParser
+
+from .market import get_market_index
+from .tools import search_job_market, draft_job_description, create_hiring_checklist, create_hiring_checklists
+from .prompts import SYSTEM_PROMPT
+from .cache import ResponseCache
+from .models import ScriptedChatModel
+
+# Connection pool shared by every session using a runtime
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+TOOLS = {
+    "search_job_market": search_job_market,
+    "draft_job_description": draft_job_description,
+    "create_hiring_checklist": create_hiring_checklist,
+    "create_hiring_checklists": create_hiring_checklists
+}
+
+def _openai_model(openai_api_key: str, model: str, temperature: float):
+    """ChatOpenAI on pooled keep-alive HTTP clients"""
+    return ChatOpenAI(
+        api_key=openai_api_key,
+        model=model,
+        temperature=temperature,
+        http_client=httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+        http_async_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    )
+
+def _fake_model(openai_api_key: str, model: str, temperature: float):
+    """Offline scripted model, timed by the HR_AGENT_FAKE_* environment variables"""
+    return ScriptedChatModel(
+        latency_mean=float(os.getenv("HR_AGENT_FAKE_LATENCY_MS", "300")) / 1000,
+        latency_stddev=float(os.getenv("HR_AGENT_FAKE_LATENCY_STDDEV_MS", "50")) / 1000,
+        tokens_per_second=float(os.getenv("HR_AGENT_FAKE_TOKENS_PER_SECOND", "60")),
+        tokens_per_second_stddev=float(os.getenv("HR_AGENT_FAKE_TOKENS_PER_SECOND_STDDEV", "10")),
+        seed=int(os.getenv("HR_AGENT_FAKE_SEED", "0"))
+    )
+
+# Chat model factories by backend name: (api key, model, temperature) -> chat model
+MODEL_BACKENDS: Dict[str, Callable[[str, str, float], Any]] = {
+    "openai": _openai_model,
+    "fake": _fake_model
+}
+
+def register_model_backend(name: str, factory: Callable[[str, str, float], Any]) -> None:
+    """Make a chat model factory available to create_hr_agent(model_backend=name)"""
+    MODEL_BACKENDS[name] = factory
+
+def default_model_backend() -> str:
+    """Backend named by HR_AGENT_MODEL_BACKEND, or openai"""
+    return os.getenv("HR_AGENT_MODEL_BACKEND", "openai")
+
+class AgentRuntime:
+    """LLM client, prompt and chain shared by all sessions with the same model settings
+
+    Building these is the expensive part of creating an agent, and the HTTP
+    clients hold keep-alive connection pools, so they are created once per
+    (backend, api key, model, temperature) and per-session agents only wrap them.
+    """
+
+    def __init__(self, openai_api_key: str, model: str, temperature: float, backend: str = "openai"):
+        if backend not in MODEL_BACKENDS:
+            raise ValueError(f"Unknown model backend: {backend}")
+        self.model = model
+        self.temperature = temperature
+        self.backend = backend
+
+        # Initialize the LLM
+        self.llm = MODEL_BACKENDS[backend](openai_api_key, model, temperature)
+
+        # Create the main prompt
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
+            MessagesPlaceholder(variable_name="chat_history"),
+            ("human", "{input}")
+        ])
+
+        # Create a simple chain
+        self.chain = self.prompt | self.llm | StrOutputParser()
+        self.tools = TOOLS
+        # Index the market data while the first turn is still being typed
+        get_market_index().preload()
+
+        # Responses are shared across sessions with the same model settings
+        self.response_cache = ResponseCache(
+            namespace=f"{backend}:{model}:{temperature}",
+            system_prompt=SYSTEM_PROMPT,
+            max_entries=int(os.getenv("HR_AGENT_RESPONSE_CACHE_SIZE", "512")),
+            ttl_seconds=float(os.getenv("HR_AGENT_RESPONSE_CACHE_TTL", "3600")),
+            history_window=int(os.getenv("HR_AGENT_RESPONSE_CACHE_HISTORY", "4")),
+            disk_dir=os.getenv("HR_AGENT_RESPONSE_CACHE_DIR") or None,
+            max_disk_entries=int(os.getenv("HR_AGENT_RESPONSE_CACHE_DISK_SIZE", "4096"))
+        )
+
+_runtimes: Dict[Tuple[str, str, str, float], AgentRuntime] = {}
+_runtimes_lock = threading.Lock()
+
+def get_runtime(openai_api_key: str, model: str = "gpt-4o", temperature: float = 0.5,
+                backend: str = None) -> AgentRuntime:
+    """Return the process-wide runtime for these model settings, creating it on first use"""
+    backend = backend or default_model_backend()
+    key = (backend, openai_api_key, model, temperature)
+    with _runtimes_lock:
+        runtime = _runtimes.get(key)
+        if runtime is None:
+            runtime = _runtimes[key] = AgentRuntime(openai_api_key, model, temperature, backend)
+        return runtime
@@ -0,0 +1,108 @@
+import functools
+import json
+import math
+from typing import Dict, List, Tuple
+
+# The base checklist below is laid out over this many weeks
+BASE_TIMELINE_WEEKS = 7
+
+# (stage, [(task, first week, last week)]), weeks 1-indexed and inclusive
+BASE_CHECKLIST = (
+    ("Pre-Hiring", (
+        ("Finalize job description", 1, 1),
+        ("Determine budget and compensation range", 1, 1),
+        ("Set up applicant tracking system", 1, 1)
+    )),
+    ("Sourcing", (
+        ("Post job on job boards", 1, 2),
+        ("Reach out to network for referrals", 1, 2),
+        ("Consider recruiter if applicable", 2, 2)
+    )),
+    ("Screening", (
+        ("Review applications", 2, 3),
+        ("Conduct initial screening calls", 3, 4)
+    )),
+    ("Interviewing", (
+        ("Technical/skills assessment", 4, 4),
+        ("Team interviews", 5, 5),
+        ("Final interview with founders", 5, 5)
+    )),
+    ("Decision & Onboarding", (
+        ("Make offer", 6, 6),
+        ("Negotiate and finalize offer", 6, 6),
+        ("Prepare onboarding plan", 6, 7)
+    ))
+)
+
+# Extra tasks for roles whose title contains the keyword: (stage, task, first week, last week)
+ROLE_TASKS = {
+    "engineer": (
+        ("Screening", "Code review or system design challenge", 3, 3),
+        ("Interviewing", "Technical deep dive with engineering team", 4, 4)
+    ),
+    "intern": (
+        ("Screening", "Review academic projects and coursework", 3, 3),
+        ("Interviewing", "AI/ML knowledge assessment", 4, 4)
+    )
+}
+
+# A checklist as immutable data: ((stage, ((task, timeframe), ...)), ...)
+Schedule = Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]
+
+def role_profile(role: str) -> Tuple[str, ...]:
+    """The ROLE_TASKS keywords a role matches; roles with equal profiles get equal checklists"""
+    role = role.lower()
+    return tuple(keyword for keyword in ROLE_TASKS if keyword in role)
+
+def scale_interval(first: int, last: int, timeline_weeks: int) -> Tuple[int, int]:
+    """Map a base-plan week interval onto a timeline of any length
+
+    Weeks are treated as spans [first - 1, last) on a continuous axis, scaled
+    by timeline_weeks / BASE_TIMELINE_WEEKS and rounded back to whole weeks,
+    so plans compress for short timelines and stretch for long ones while
+    keeping task order. Every task keeps at least one week.
+    """
+    scale = timeline_weeks / BASE_TIMELINE_WEEKS
+    start = min(timeline_weeks, math.floor((first - 1) * scale + 0.5) + 1)
+    end = min(timeline_weeks, max(start, math.floor(last * scale + 0.5)))
+    return start, end
+
+def format_timeframe(start: int, end: int) -> str:
+    return f"Week {start}" if start == end else f"Weeks {start}-{end}"
+
+@functools.lru_cache(maxsize=512)
+def _schedule_profile(profile: Tuple[str, ...], timeline_weeks: int) -> Schedule:
+    """Scaled checklist for a role profile, with timeframes rendered once"""
+    stages = {stage: list(tasks) for stage, tasks in BASE_CHECKLIST}
+    for keyword in profile:
+        for stage, task, first, last in ROLE_TASKS[keyword]:
+            stages[stage].append((task, first, last))
+    return tuple(
+        (stage, tuple((task, format_timeframe(*scale_interval(first, last, timeline_weeks)))
+                      for task, first, last in tasks))
+        for stage, tasks in stages.items()
+    )
+
+@functools.lru_cache(maxsize=512)
+def _profile_json(profile: Tuple[str, ...], timeline_weeks: int) -> str:
+    return json.dumps(_as_dict(_schedule_profile(profile, timeline_weeks)), indent=2)
+
+def _as_dict(schedule: Schedule) -> Dict[str, List[Dict[str, str]]]:
+    return {stage: [{"task": task, "timeframe": timeframe} for task, timeframe in tasks]
+            for stage, tasks in schedule}
+
+def _weeks(timeline_weeks: int) -> int:
+    return max(1, int(timeline_weeks))
+
+def build_checklist(role: str, timeline_weeks: int) -> Dict[str, List[Dict[str, str]]]:
+    """Hiring checklist for one role as {stage: [{"task", "timeframe"}]}"""
+    return _as_dict(_schedule_profile(role_profile(role), _weeks(timeline_weeks)))
+
+def checklist_json(role: str, timeline_weeks: int) -> str:
+    """build_checklist() serialized as indented JSON"""
+    return _profile_json(role_profile(role), _weeks(timeline_weeks))
+
+def build_checklists(roles: List[str], timeline_weeks: int) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+    """Checklists for many roles on one timeline, scheduled once per distinct role profile"""
+    weeks = _weeks(timeline_weeks)
+    return {role: _as_dict(_schedule_profile(role_profile(role), weeks)) for role in roles}
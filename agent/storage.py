@@ -0,0 +1,608 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from .catalog import SessionCatalog
+
+# Top-level session keys whose dict items are stored as individual rows
+ARTIFACT_KEYS = ("hiring_needs", "job_descriptions", "hiring_checklists", "user_info")
+
+def apply_entry(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Apply a single journal entry to a session state dict"""
+    op, key = entry["op"], entry["key"]
+    if op == "set":
+        state[key] = entry["value"]
+    elif op == "append":
+        state.setdefault(key, []).append(entry["value"])
+    elif op == "set_item":
+        state.setdefault(key, {})[entry["field"]] = entry["value"]
+
+class StorageBackend:
+    """Persistence interface shared by SessionMemory, AnalyticsTracker and the app
+
+    Session mutations arrive as journal entries of the form
+    {"op": "set" | "append" | "set_item", "key": ..., "value": ..., ["field": ...]}.
+    """
+
+    def __init__(self):
+        self.io_stats = {"writes": 0, "fsyncs": 0, "snapshots": 0}
+        # Subclasses set these up; the catalog shares the backend's lock
+        self.catalog: Optional[SessionCatalog] = None
+        self._lock = threading.RLock()
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the full state of a session, or None if it does not exist"""
+        raise NotImplementedError
+
+    def create_session(self, session_id: str, state: Dict[str, Any], durable: bool = False) -> None:
+        """Persist the initial state of a new session"""
+        raise NotImplementedError
+
+    def append_entries(self, session_id: str, entries: List[Dict[str, Any]],
+                       state: Dict[str, Any], durable: bool = False) -> None:
+        """Persist mutations; state is the session's current full state"""
+        raise NotImplementedError
+
+    def compact(self, session_id: str, state: Dict[str, Any], durable: bool = False) -> None:
+        """Fold any per-session log into a compact representation"""
+
+    def recent_messages(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Return the last `limit` conversation messages, oldest first"""
+        raise NotImplementedError
+
+    def list_sessions(self) -> List[str]:
+        """Return the ids of all stored sessions"""
+        raise NotImplementedError
+
+    def query_sessions(self, offset: int = 0, limit: int = 20, sort_by: str = "last_active",
+                       descending: bool = True, role: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return a page of session catalog rows (id, created_at, last_active, message_count, roles)"""
+        with self._lock:
+            return self.catalog.query(offset=offset, limit=limit, sort_by=sort_by,
+                                      descending=descending, role=role)
+
+    def count_sessions(self, role: Optional[str] = None) -> int:
+        """Count catalogued sessions, optionally only those hiring for a role"""
+        with self._lock:
+            return self.catalog.count(role=role)
+
+    def rebuild_catalog(self) -> None:
+        """Re-index every stored session into the catalog"""
+        with self._lock:
+            for session_id in self.list_sessions():
+                state = self.load_session(session_id)
+                if state is not None:
+                    self.catalog.record_state(dict(state, session_id=session_id))
+            self._commit_catalog()
+
+    def _commit_catalog(self) -> None:
+        raise NotImplementedError
+
+    def append_analytics_event(self, event: Dict[str, Any]) -> None:
+        """Append one analytics event to the event log"""
+        raise NotImplementedError
+
+    def read_analytics_events(self, cursor: Any) -> Tuple[List[Dict[str, Any]], Any]:
+        """Return events logged after `cursor` (None for the start) and the new cursor
+
+        Events are not guaranteed to be in global time order.
+        """
+        raise NotImplementedError
+
+    def analytics_cursor_current(self, cursor: Any) -> bool:
+        """False once events `cursor` has not covered may have been retired elsewhere"""
+        return True
+
+    def retire_analytics_events(self, cursor: Any) -> Any:
+        """Drop event logs `cursor` fully covers and nobody writes to any more
+
+        Only call once a checkpoint holding `cursor` is saved. Returns the
+        cursor to use from then on.
+        """
+        return cursor
+
+    def load_analytics(self) -> Dict[str, Any]:
+        """Load the analytics rollup document, or an empty one"""
+        raise NotImplementedError
+
+    def save_analytics(self, data: Dict[str, Any]) -> None:
+        """Save the analytics rollup document"""
+        raise NotImplementedError
+
+class JsonFileBackend(StorageBackend):
+    """Per-session JSON snapshots plus append-only journals under data/session_data
+
+    Mutations are appended to <id>.log and replayed over the <id>.json snapshot on
+    load. Snapshots carry a sequence watermark so that a crash between writing a
+    snapshot and truncating the journal never replays an entry twice.
+    """
+    # Compact the journal into a fresh snapshot once it outgrows both this
+    # floor and the snapshot itself, keeping rewrites amortised O(1) per turn
+    COMPACT_MIN_BYTES = 64 * 1024
+
+    def __init__(self, data_dir: str = os.path.join("data", "session_data"),
+                 analytics_dir: str = os.path.join("data", "analytics")):
+        super().__init__()
+        self.data_dir = data_dir
+        self.analytics_dir = analytics_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs(self.analytics_dir, exist_ok=True)
+        self.analytics_file = os.path.join(self.analytics_dir, "usage_stats.json")
+        # Each process appends to its own shard, so writers never contend
+        self.shards_dir = os.path.join(self.analytics_dir, "events")
+        os.makedirs(self.shards_dir, exist_ok=True)
+        self._shard_lock = threading.Lock()
+        # Per-session journal bookkeeping: seq, journal_bytes, snapshot_bytes
+        self._journals: Dict[str, Dict[str, int]] = {}
+        # Streamlit runs each rerun on its own thread, so share one connection behind a lock
+        self._catalog_conn = sqlite3.connect(os.path.join(self.data_dir, "catalog.db"),
+                                             timeout=30, check_same_thread=False)
+        self._catalog_conn.execute("PRAGMA journal_mode=WAL")
+        self._set_synchronous(False)
+        self.catalog = SessionCatalog(self._catalog_conn)
+        if self.catalog.is_empty():
+            # First run against existing session files: index them once
+            self.rebuild_catalog()
+
+    def _commit_catalog(self, durable: bool = False) -> None:
+        self._catalog_conn.commit()
+        if durable:
+            # synchronous=FULL: the commit fsyncs the catalog WAL
+            self.io_stats["fsyncs"] += 1
+
+    def _set_synchronous(self, durable: bool) -> None:
+        # The catalog commits with every append, so it follows the journal's
+        # durability: WAL + NORMAL only syncs at checkpoints, FULL every commit
+        self._catalog_conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+
+    def _snapshot_path(self, session_id: str) -> str:
+        return os.path.join(self.data_dir, f"{session_id}.json")
+
+    def _journal_path(self, session_id: str) -> str:
+        return os.path.join(self.data_dir, f"{session_id}.log")
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        snapshot_file = self._snapshot_path(session_id)
+        if not os.path.exists(snapshot_file):
+            return None
+
+        with self._lock:
+            with open(snapshot_file, 'r') as f:
+                state = json.load(f)
+            # Entries at or below the watermark are already in the snapshot
+            meta = {
+                "seq": state.pop("_journal_seq", 0),
+                "journal_bytes": 0,
+                "snapshot_bytes": os.path.getsize(snapshot_file)
+            }
+            self._replay_journal(session_id, state, meta)
+            self._journals[session_id] = meta
+            return state
+
+    def _replay_journal(self, session_id: str, state: Dict[str, Any], meta: Dict[str, int]) -> None:
+        """Apply journal entries written after the snapshot"""
+        journal_file = self._journal_path(session_id)
+        if not os.path.exists(journal_file):
+            return
+
+        with open(journal_file, 'r') as f:
+            for line in f:
+                meta["journal_bytes"] += len(line)
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write
+                    break
+                if entry["seq"] > meta["seq"]:
+                    apply_entry(state, entry)
+                    meta["seq"] = entry["seq"]
+
+    def create_session(self, session_id: str, state: Dict[str, Any], durable: bool = False) -> None:
+        with self._lock:
+            self._journals[session_id] = {"seq": 0, "journal_bytes": 0, "snapshot_bytes": 0}
+            self._write_snapshot(session_id, state, durable)
+            self._set_synchronous(durable)
+            self.catalog.add_session(session_id, state.get("created_at", ""))
+            self._commit_catalog(durable)
+
+    def append_entries(self, session_id: str, entries: List[Dict[str, Any]],
+                       state: Dict[str, Any], durable: bool = False) -> None:
+        """Append entries to the journal in one write, compacting when it grows too large"""
+        with self._lock:
+            meta = self._journals.get(session_id)
+            if meta is None:
+                # Another backend instance created the session; pick up its watermark
+                self.load_session(session_id)
+                meta = self._journals[session_id]
+
+            lines = []
+            for entry in entries:
+                meta["seq"] += 1
+                lines.append(json.dumps(dict(entry, seq=meta["seq"])) + "\n")
+            data = "".join(lines)
+
+            with open(self._journal_path(session_id), 'a') as f:
+                f.write(data)
+                self.io_stats["writes"] += 1
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.io_stats["fsyncs"] += 1
+            meta["journal_bytes"] += len(data)
+            self._set_synchronous(durable)
+            self.catalog.record_entries(session_id, entries)
+            self._commit_catalog(durable)
+
+            if meta["journal_bytes"] > max(self.COMPACT_MIN_BYTES, meta["snapshot_bytes"]):
+                self.compact(session_id, state, durable)
+
+    def _write_snapshot(self, session_id: str, state: Dict[str, Any], durable: bool) -> None:
+        """Atomically write a snapshot of the state to file"""
+        meta = self._journals[session_id]
+        snapshot_file = self._snapshot_path(session_id)
+        tmp_file = snapshot_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(dict(state, _journal_seq=meta["seq"]), f, indent=2)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+                self.io_stats["fsyncs"] += 1
+        os.replace(tmp_file, snapshot_file)
+        meta["snapshot_bytes"] = os.path.getsize(snapshot_file)
+        self.io_stats["snapshots"] += 1
+
+    def compact(self, session_id: str, state: Dict[str, Any], durable: bool = False) -> None:
+        """Fold the journal into a fresh snapshot and truncate it"""
+        with self._lock:
+            if session_id not in self._journals:
+                self.load_session(session_id)
+            self._write_snapshot(session_id, state, durable)
+            # Safe even if we crash before truncating: replay skips entries
+            # covered by the snapshot's watermark
+            open(self._journal_path(session_id), 'w').close()
+            self._journals[session_id]["journal_bytes"] = 0
+
+    def recent_messages(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        # Plain files have no index, so this still parses the whole session
+        state = self.load_session(session_id) or {}
+        return (state.get("conversation_history") or [])[-limit:]
+
+    def list_sessions(self) -> List[str]:
+        return [f[:-len(".json")] for f in os.listdir(self.data_dir) if f.endswith(".json")]
+
+    def _shard_path(self) -> str:
+        # Looked up per call so that forked workers get a shard of their own
+        return os.path.join(self.shards_dir, f"{socket.gethostname()}-{os.getpid()}.log")
+
+    def _shard_files(self) -> Dict[str, str]:
+        """Map shard name to path, including the pre-sharding events.log"""
+        shards = {name: os.path.join(self.shards_dir, name)
+                  for name in os.listdir(self.shards_dir) if name.endswith(".log")}
+        legacy_file = os.path.join(self.analytics_dir, "events.log")
+        if os.path.exists(legacy_file):
+            shards["events.log"] = legacy_file
+        return shards
+
+    def append_analytics_event(self, event: Dict[str, Any]) -> None:
+        # A single O_APPEND write per event, whatever the size of the history
+        line = json.dumps(event) + "\n"
+        with self._shard_lock:
+            with open(self._shard_path(), 'a') as f:
+                f.write(line)
+
+    def read_analytics_events(self, cursor: Any) -> Tuple[List[Dict[str, Any]], Any]:
+        """Read complete lines past each shard's byte offset
+
+        The cursor maps shard name to offset. Events come back grouped by shard,
+        not globally ordered, so consumers must fold them order-independently.
+        """
+        if isinstance(cursor, int):
+            # Cursor from before sharding: an offset into events.log
+            cursor = {"events.log": cursor}
+        shards = self._shard_files()
+        # Shards missing from disk were retired after a checkpoint covered them
+        offsets = {name: offset for name, offset in (cursor or {}).items() if name in shards}
+
+        events = []
+        for name, path in shards.items():
+            offset = offsets.get(name, 0)
+            if os.path.getsize(path) <= offset:
+                # Nothing new: skip opening the shard
+                offsets[name] = offset
+                continue
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # The shard's writer is mid-append; pick it up next time
+                        break
+                    offset += len(line)
+                    events.append(json.loads(line))
+            offsets[name] = offset
+        return events, offsets
+
+    def analytics_cursor_current(self, cursor: Any) -> bool:
+        if not isinstance(cursor, dict):
+            return True
+        return all(os.path.exists(os.path.join(self.shards_dir, name))
+                   for name in cursor if name != "events.log")
+
+    def _shard_writer_exited(self, name: str) -> bool:
+        """True if a shard was written by a process on this host that has exited"""
+        host, _, pid = name[:-len(".log")].rpartition("-")
+        if host != socket.gethostname() or not pid.isdigit() or int(pid) == os.getpid():
+            # Writers on other hosts can't be checked from here
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            # Alive, but owned by another user
+            return False
+        return False
+
+    def retire_analytics_events(self, cursor: Any) -> Any:
+        """Delete shards of exited writers that `cursor` has read to the end
+
+        Their events live on in the checkpoint, so refreshes stop listing and
+        opening them. The pre-sharding events.log is left alone.
+        """
+        if not isinstance(cursor, dict):
+            return cursor
+        offsets = dict(cursor)
+        for name, offset in cursor.items():
+            path = os.path.join(self.shards_dir, name)
+            if name == "events.log" or not self._shard_writer_exited(name):
+                continue
+            try:
+                if os.path.getsize(path) != offset:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                # Already retired by another process
+                pass
+            del offsets[name]
+        return offsets
+
+    def load_analytics(self) -> Dict[str, Any]:
+        if os.path.exists(self.analytics_file):
+            with open(self.analytics_file, 'r') as f:
+                return json.load(f)
+        else:
+            return {"sessions": [], "tool_usage": {}, "role_requests": {}}
+
+    def save_analytics(self, data: Dict[str, Any]) -> None:
+        # Every process checkpoints a self-consistent rollup (aggregates plus the
+        # cursor they cover), so concurrent writers may race: last replace wins
+        tmp_file = f"{self.analytics_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, self.analytics_file)
+
+class SqliteBackend(StorageBackend):
+    """SQLite store with messages and hiring artifacts as individually indexed rows"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_messages_session_time ON messages (session_id, timestamp);
+    CREATE TABLE IF NOT EXISTS artifacts (
+        session_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        name TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (session_id, kind, name)
+    );
+    CREATE TABLE IF NOT EXISTS fields (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (session_id, key)
+    );
+    CREATE TABLE IF NOT EXISTS analytics (
+        name TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS analytics_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        data TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, db_path: str = os.path.join("data", "hr_agent.db")):
+        super().__init__()
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Streamlit runs each rerun on its own thread, so share one connection behind a lock
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self.catalog = SessionCatalog(self._conn)
+            self._conn.commit()
+            if self.catalog.is_empty():
+                self.rebuild_catalog()
+
+    def _commit_catalog(self) -> None:
+        self._conn.commit()
+
+    def _commit(self, durable: bool) -> None:
+        self._conn.commit()
+        self.io_stats["writes"] += 1
+        if durable:
+            self.io_stats["fsyncs"] += 1
+
+    def _set_synchronous(self, durable: bool) -> None:
+        # WAL + NORMAL only syncs at checkpoints; FULL syncs every commit
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            state: Dict[str, Any] = {"session_id": session_id, "created_at": row[0]}
+            for key, value in self._conn.execute(
+                "SELECT key, value FROM fields WHERE session_id = ?", (session_id,)
+            ):
+                state[key] = json.loads(value)
+            for key in ARTIFACT_KEYS:
+                state.setdefault(key, {})
+            for kind, name, value in self._conn.execute(
+                "SELECT kind, name, value FROM artifacts WHERE session_id = ?", (session_id,)
+            ):
+                state.setdefault(kind, {})[name] = json.loads(value)
+            state["conversation_history"] = [
+                {"role": role, "content": content, "timestamp": timestamp}
+                for timestamp, role, content in self._conn.execute(
+                    "SELECT timestamp, role, content FROM messages WHERE session_id = ? ORDER BY id",
+                    (session_id,)
+                )
+            ]
+            return state
+
+    def create_session(self, session_id: str, state: Dict[str, Any], durable: bool = False) -> None:
+        with self._lock:
+            self._set_synchronous(durable)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, created_at) VALUES (?, ?)",
+                (session_id, state.get("created_at", ""))
+            )
+            self.catalog.add_session(session_id, state.get("created_at", ""))
+            for key, value in state.items():
+                if key not in ("session_id", "created_at"):
+                    self._apply_entry(session_id, {"op": "set", "key": key, "value": value})
+            self._commit(durable)
+
+    def append_entries(self, session_id: str, entries: List[Dict[str, Any]],
+                       state: Dict[str, Any], durable: bool = False) -> None:
+        with self._lock:
+            self._set_synchronous(durable)
+            for entry in entries:
+                self._apply_entry(session_id, entry)
+            self.catalog.record_entries(session_id, entries)
+            self._commit(durable)
+
+    def _apply_entry(self, session_id: str, entry: Dict[str, Any]) -> None:
+        """Translate a journal entry into row-level writes"""
+        op, key, value = entry["op"], entry["key"], entry["value"]
+
+        if key == "conversation_history":
+            if op == "set":
+                self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                messages = value or []
+            else:
+                messages = [value]
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, timestamp, role, content) VALUES (?, ?, ?, ?)",
+                [(session_id, m.get("timestamp", ""), m["role"], m["content"]) for m in messages]
+            )
+        elif key in ARTIFACT_KEYS and op == "set_item":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (session_id, kind, name, value) VALUES (?, ?, ?, ?)",
+                (session_id, key, entry["field"], json.dumps(value))
+            )
+        elif key in ARTIFACT_KEYS and isinstance(value, dict):
+            self._conn.execute("DELETE FROM artifacts WHERE session_id = ? AND kind = ?", (session_id, key))
+            self._conn.executemany(
+                "INSERT INTO artifacts (session_id, kind, name, value) VALUES (?, ?, ?, ?)",
+                [(session_id, key, name, json.dumps(item)) for name, item in value.items()]
+            )
+        elif op == "set":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fields (session_id, key, value) VALUES (?, ?, ?)",
+                (session_id, key, json.dumps(value))
+            )
+        else:
+            # Appends/item updates on free-form keys: read-modify-write the field
+            row = self._conn.execute(
+                "SELECT value FROM fields WHERE session_id = ? AND key = ?", (session_id, key)
+            ).fetchone()
+            state = {key: json.loads(row[0])} if row else {}
+            apply_entry(state, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fields (session_id, key, value) VALUES (?, ?, ?)",
+                (session_id, key, json.dumps(state[key]))
+            )
+
+    def recent_messages(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT timestamp, role, content FROM messages WHERE session_id = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (session_id, limit)
+            ).fetchall()
+        return [{"role": role, "content": content, "timestamp": timestamp}
+                for timestamp, role, content in reversed(rows)]
+
+    def list_sessions(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT session_id FROM sessions ORDER BY created_at"
+            )]
+
+    def append_analytics_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute("INSERT INTO analytics_events (data) VALUES (?)", (json.dumps(event),))
+            self._commit(False)
+
+    def read_analytics_events(self, cursor: Any) -> Tuple[List[Dict[str, Any]], Any]:
+        """Read events with ids past `cursor`"""
+        last_id = cursor or 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data FROM analytics_events WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+        if rows:
+            last_id = rows[-1][0]
+        return [json.loads(data) for _, data in rows], last_id
+
+    def load_analytics(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM analytics WHERE name = 'usage_stats'"
+            ).fetchone()
+        if row is None:
+            return {"sessions": [], "tool_usage": {}, "role_requests": {}}
+        return json.loads(row[0])
+
+    def save_analytics(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analytics (name, data) VALUES ('usage_stats', ?)",
+                (json.dumps(data),)
+            )
+            self._commit(False)
+
+_default_backend: Optional[StorageBackend] = None
+_default_backend_lock = threading.Lock()
+
+def get_storage_backend() -> StorageBackend:
+    """Return the process-wide backend chosen by HR_AGENT_STORAGE ("json" or "sqlite")"""
+    global _default_backend
+    with _default_backend_lock:
+        if _default_backend is None:
+            kind = os.getenv("HR_AGENT_STORAGE", "json").lower()
+            if kind == "sqlite":
+                _default_backend = SqliteBackend(os.getenv("HR_AGENT_DB_PATH", os.path.join("data", "hr_agent.db")))
+            elif kind == "json":
+                _default_backend = JsonFileBackend()
+            else:
+                raise ValueError(f"Unknown storage backend: {kind}")
+        return _default_backend
@@ -0,0 +1,162 @@
+import logging
+import os
+import threading
+import time
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+from . import PACKAGE_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(PACKAGE_DATA_DIR, "templates")
+TEMPLATE_EXTENSION = ".md"
+
+# Template used for roles that match no alias
+DEFAULT_TEMPLATE = "generic"
+
+# Placeholders a template body may use
+TEMPLATE_FIELDS = ("role", "role_title", "skills", "experience_level")
+
+# How often, at most, the directory is checked for changed files
+RELOAD_INTERVAL_SECONDS = 1.0
+
+def normalize_role(role: str) -> str:
+    """Canonical form of a role title for alias lookups"""
+    return " ".join(role.lower().replace("_", " ").split())
+
+class CompiledTemplate:
+    """A job description template parsed once into literal and placeholder parts"""
+
+    def __init__(self, name: str, path: str, text: str):
+        self.name = name
+        self.path = path
+        self.aliases, body = self._split_front_matter(text)
+        self.aliases.insert(0, normalize_role(name))
+        # (literal text, placeholder name or None) pairs, as str.format would see them
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, _spec, _conversion in Formatter().parse(body):
+            if field is not None and field not in TEMPLATE_FIELDS:
+                raise ValueError(f"Unknown placeholder {{{field}}} in template {path}")
+            self.parts.append((literal, field))
+
+    @staticmethod
+    def _split_front_matter(text: str) -> Tuple[List[str], str]:
+        """Read the optional "---" header; only its aliases line is used"""
+        aliases = []
+        if not text.startswith("---\n"):
+            return aliases, text
+        header, _, body = text[4:].partition("\n---\n")
+        for line in header.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip() == "aliases":
+                aliases.extend(normalize_role(a) for a in value.split(",") if a.strip())
+        return aliases, body.lstrip("\n")
+
+    def render(self, values: Dict[str, str]) -> str:
+        return "".join(literal + (values[field] if field else "") for literal, field in self.parts)
+
+class TemplateStore:
+    """Job description templates loaded from a directory, with hot reload
+
+    Each `<name>.md` file is compiled once and kept until its mtime or size
+    changes. Roles resolve through an alias index: the full normalized title
+    first, then shorter trailing word runs ("senior backend engineer",
+    "backend engineer", "engineer"), then the default template. `generation`
+    increases whenever the set of compiled templates changes. A file that
+    fails to compile is logged and skipped, keeping its last good version.
+    """
+
+    def __init__(self, directory: str = TEMPLATE_DIR, reload_interval: float = RELOAD_INTERVAL_SECONDS):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.generation = 0
+        self._templates: Dict[str, CompiledTemplate] = {}
+        # file name -> (mtime_ns, size) the compiled template was built from
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Recompile templates whose files changed since the last check"""
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+
+            seen = {}
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.is_file() and entry.name.endswith(TEMPLATE_EXTENSION):
+                        stat = entry.stat()
+                        seen[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+            if seen == self._signatures:
+                return
+
+            templates = {}
+            for file_name, signature in seen.items():
+                name = file_name[:-len(TEMPLATE_EXTENSION)]
+                previous = self._templates.get(name)
+                if previous is not None and self._signatures.get(file_name) == signature:
+                    templates[name] = previous
+                    continue
+                path = os.path.join(self.directory, file_name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        templates[name] = CompiledTemplate(name, path, f.read())
+                except (OSError, UnicodeDecodeError, ValueError) as e:
+                    # A broken edit must not take down drafting for every role: keep
+                    # the last good version (if any) until the file changes again
+                    logger.warning("Skipping job description template %s: %s", path, e)
+                    if previous is not None:
+                        templates[name] = previous
+
+            aliases = {}
+            for name in sorted(templates):
+                for alias in templates[name].aliases:
+                    aliases.setdefault(alias, name)
+
+            self._templates = templates
+            self._aliases = aliases
+            self._signatures = seen
+            self.generation += 1
+
+    def resolve(self, role: str) -> CompiledTemplate:
+        """Template for a role title"""
+        self.refresh()
+        words = normalize_role(role).split()
+        for start in range(len(words)):
+            name = self._aliases.get(" ".join(words[start:]))
+            if name is not None:
+                return self._templates[name]
+        if DEFAULT_TEMPLATE not in self._templates:
+            raise LookupError(f"No template for {role!r} and no {DEFAULT_TEMPLATE}{TEMPLATE_EXTENSION} in {self.directory}")
+        return self._templates[DEFAULT_TEMPLATE]
+
+    def render(self, role: str, skills: List[str], experience_level: str) -> str:
+        """Fill the role's template"""
+        return self.resolve(role).render({
+            "role": role,
+            "role_title": role.title(),
+            "skills": ", ".join(skills),
+            "experience_level": experience_level
+        })
+
+    def names(self) -> List[str]:
+        self.refresh()
+        return sorted(self._templates)
+
+_stores: Dict[str, TemplateStore] = {}
+_stores_lock = threading.Lock()
+
+def get_template_store(directory: str = None) -> TemplateStore:
+    """Return the shared template store for a directory (HR_AGENT_TEMPLATE_DIR or the shipped data/templates)"""
+    directory = directory or os.getenv("HR_AGENT_TEMPLATE_DIR", TEMPLATE_DIR)
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = TemplateStore(directory)
+        return store
@@ -0,0 +1,37 @@
+import math
+import threading
+from typing import Any, Optional
+
+# Rough per-message framing cost of the chat format (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encoder: Optional[Any] = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+def _get_encoder() -> Optional[Any]:
+    """Load the tiktoken encoding once; None if tiktoken or its data is unavailable"""
+    global _encoder, _encoder_loaded
+    if _encoder_loaded:
+        return _encoder
+    with _encoder_lock:
+        if not _encoder_loaded:
+            try:
+                import tiktoken
+                _encoder = tiktoken.encoding_for_model("gpt-4o")
+            except Exception:
+                # Not installed, or the BPE file can't be fetched on an offline box
+                _encoder = None
+            _encoder_loaded = True
+    return _encoder
+
+def count_tokens(text: str) -> int:
+    """Count tokens locally, falling back to ~4 characters per token"""
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+def count_message_tokens(text: str) -> int:
+    """Tokens a single chat message costs in the prompt"""
+    return count_tokens(text) + MESSAGE_OVERHEAD_TOKENS
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+# Samples kept per stage; percentiles describe the most recent window
+DEFAULT_WINDOW = 1024
+
+class LatencyHistogram:
+    """Rolling window of latency samples for one stage
+
+    Samples go into a fixed-size ring buffer, so recording is O(1) and memory
+    stays bounded; percentiles are computed over the window only when asked for.
+    The buffer is a plain list because item assignment on it is several times
+    cheaper than on a NumPy array, and recording sits on the request path.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.samples = [0] * window
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.samples[self.count % len(self.samples)] = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and max over all samples; p50/p95/p99 over the window, in ms"""
+        window = np.array(self.samples[:min(self.count, len(self.samples))], dtype=np.int64)
+        p50, p95, p99 = np.percentile(window, [50, 95, 99]) / 1e6 if len(window) else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": self.max_ns / 1e6
+        }
+
+class _Span:
+    """Context manager timing one stage on the monotonic clock"""
+    __slots__ = ("tracer", "stage", "started")
+
+    def __init__(self, tracer: "StageTracer", stage: str):
+        self.tracer = tracer
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.stage, time.perf_counter_ns() - self.started)
+        return False
+
+class StageTracer:
+    """Per-stage latency histograms for agent turns
+
+    Stages are plain names such as "history", "llm", "persist" or "extract";
+    a histogram is created the first time a stage is recorded.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self.enabled = True
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> _Span:
+        """Time the enclosed block as one sample of `name`"""
+        return _Span(self, name)
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        """Add one duration, in nanoseconds, to a stage's histogram"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(self.window)
+            histogram.record(elapsed_ns)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Latency summary per stage, stages in first-recorded order"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in self._histograms.items()}
+
+    def reset(self) -> None:
+        """Forget every recorded sample"""
+        with self._lock:
+            self._histograms.clear()
+
+_tracer: Optional[StageTracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> StageTracer:
+    """Return the process-wide tracer shared by all agents"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = StageTracer()
+        return _tracer
@@ -6,8 +6,10 @@ import pandas as pd
 import uuid
 import traceback
 from agent.agent import create_hr_agent
-from agent.memory import SessionMemory, AnalyticsTracker
-from langchain_core.messages import AIMessage, HumanMessage
+from agent.memory import AnalyticsTracker
+from agent.storage import get_storage_backend
+from agent.intents import classify
+from agent.tools import tool_cache_stats
 
 
 # Load environment variables
@@ -18,6 +20,37 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 os.makedirs("data/session_data", exist_ok=True)
 os.makedirs("data/analytics", exist_ok=True)
 
+# Number of sessions listed per page in the sidebar session picker
+SESSIONS_PER_PAGE = 20
+
+def open_session(session_id):
+    """Point this page at a session, handing back the memory of the one it held before"""
+    # Build the new agent first, so a failure leaves the current session intact
+    agent = create_hr_agent(OPENAI_API_KEY, session_id)
+    previous = st.session_state.get("agent")
+    st.session_state.session_id = session_id
+    st.session_state.agent = agent
+    # The page reads the agent's memory: one in-process SessionMemory per session,
+    # released when the agent is closed or its Streamlit session is dropped
+    st.session_state.memory = agent.memory
+    st.session_state.analytics = AnalyticsTracker(session_id)
+    if previous is not None:
+        previous.close()
+
+@st.cache_data(max_entries=256)
+def render_hiring_plan(plan_json, _plan=None):
+    """Markdown for one hiring plan, cached by the plan's JSON text
+
+    _plan is the already-parsed plan when the agent stored one; the leading
+    underscore keeps it out of the cache key, so only the JSON text is hashed.
+    """
+    plan = _plan if _plan is not None else json.loads(plan_json)
+    lines = []
+    for stage, tasks in plan.items():
+        lines.append(f"### {stage}")
+        lines.extend(f"- {task['task']} ({task['timeframe']})" for task in tasks)
+    return "\n".join(lines)
+
 # App title and configuration
 st.set_page_config(
     page_title="HR Hiring Agent",
@@ -37,9 +70,7 @@ with tab1:
         st.session_state.session_id = str(uuid.uuid4())
         st.session_state.messages = []
         try:
-            st.session_state.agent = create_hr_agent(OPENAI_API_KEY, st.session_state.session_id)
-            st.session_state.memory = SessionMemory(st.session_state.session_id)
-            st.session_state.analytics = AnalyticsTracker(st.session_state.session_id)
+            open_session(st.session_state.session_id)
             # Add a welcome message
             st.session_state.messages.append({
                 "role": "assistant",
@@ -57,22 +88,45 @@ with tab1:
         
         # Session management dropdown
         st.subheader("Session Management")
-        sessions_dir = os.path.join("data", "session_data")
-        os.makedirs(sessions_dir, exist_ok=True)
-        sessions = [f for f in os.listdir(sessions_dir) if f.endswith(".json")]
+        backend = get_storage_backend()
+        sort_labels = {
+            "last_active": "Last active",
+            "created_at": "Created",
+            "message_count": "Messages"
+        }
+        sort_by = st.selectbox("Sort sessions by", list(sort_labels), format_func=sort_labels.get)
+        role_filter = st.text_input("Filter by role", "").strip().lower()
+        page = st.number_input("Page", min_value=1, value=1, step=1)
+        
+        # Fetch one extra row to know whether another page exists
+        sessions = backend.query_sessions(
+            offset=(page - 1) * SESSIONS_PER_PAGE,
+            limit=SESSIONS_PER_PAGE + 1,
+            sort_by=sort_by,
+            role=role_filter or None
+        )
+        if len(sessions) > SESSIONS_PER_PAGE:
+            sessions = sessions[:SESSIONS_PER_PAGE]
+            st.caption(f"Showing page {page}. Increase the page number to see more sessions.")
         
         if sessions:
-            session_options = ["Current Session"] + sessions
-            selected_session = st.selectbox("Load Previous Session", session_options)
+            session_labels = {
+                s["session_id"]: f"{s['session_id'][:8]} · {s['message_count']} msgs · "
+                                 f"{s['last_active'][:16].replace('T', ' ')}"
+                                 + (f" · {', '.join(s['roles'])}" if s["roles"] else "")
+                for s in sessions
+            }
+            session_options = ["Current Session"] + list(session_labels)
+            selected_session = st.selectbox(
+                "Load Previous Session",
+                session_options,
+                format_func=lambda option: session_labels.get(option, option)
+            )
             
-            if selected_session != "Current Session" and selected_session != st.session_state.session_id + ".json":
+            if selected_session != "Current Session" and selected_session != st.session_state.session_id:
                 try:
                     # Load the selected session
-                    new_session_id = selected_session.replace(".json", "")
-                    st.session_state.session_id = new_session_id
-                    st.session_state.memory = SessionMemory(new_session_id)
-                    st.session_state.agent = create_hr_agent(OPENAI_API_KEY, new_session_id)
-                    st.session_state.analytics = AnalyticsTracker(new_session_id)
+                    open_session(selected_session)
                     
                     # Load previous messages
                     st.session_state.messages = []
@@ -91,11 +145,8 @@ with tab1:
         # Add button to start a new session
         if st.button("Start New Session"):
             try:
-                st.session_state.session_id = str(uuid.uuid4())
+                open_session(str(uuid.uuid4()))
                 st.session_state.messages = []
-                st.session_state.agent = create_hr_agent(OPENAI_API_KEY, st.session_state.session_id)
-                st.session_state.memory = SessionMemory(st.session_state.session_id)
-                st.session_state.analytics = AnalyticsTracker(st.session_state.session_id)
                 # Add a welcome message
                 st.session_state.messages.append({
                     "role": "assistant",
@@ -105,12 +156,19 @@ with tab1:
             except Exception as e:
                 st.error(f"Error creating new session: {str(e)}")
         
+        # Per-session switch for the shared response cache
+        st.session_state.agent.cache_enabled = st.checkbox(
+            "Reuse cached answers",
+            value=True,
+            help="Answer repeated questions from the response cache instead of calling the model again"
+        )
+        
         # Display current hiring needs
         st.subheader("Current Hiring Needs")
         hiring_needs = st.session_state.memory.get("hiring_needs") or {}
         
-        if hiring_needs:
-            for role, details in hiring_needs.items():
+        if hiring_needs.get("roles"):
+            for role in hiring_needs["roles"]:
                 st.write(f"**Role:** {role}")
                 # Display skills if available
                 if "skills" in hiring_needs and role in hiring_needs["skills"]:
@@ -143,35 +201,37 @@ with tab1:
                 st.session_state.selected_prompt = prompt
                 st.experimental_rerun()
     
+    # Artifacts are shown under the latest message that produced them; older
+    # ones would only repeat the current artifacts from memory
+    latest_job_descriptions = latest_hiring_plan = None
+    for index, message in enumerate(st.session_state.messages):
+        if "I've created job descriptions" in message["content"]:
+            latest_job_descriptions = index
+        if "I've created a hiring plan" in message["content"]:
+            latest_hiring_plan = index
+    hiring_details = st.session_state.memory.get("hiring_needs") or {}
+    
     # Display chat messages
-    for message in st.session_state.messages:
+    for index, message in enumerate(st.session_state.messages):
         with st.chat_message(message["role"]):
             st.write(message["content"])
             
-            # If there are job descriptions or hiring plans in the message, show them in expandable sections
-            if "job descriptions" in message["content"].lower() and "I've created job descriptions" in message["content"]:
-                # Extract job descriptions from the memory
-                hiring_details = st.session_state.memory.get("hiring_needs") or {}
-                if "job_descriptions" in hiring_details:
-                    for role, desc in hiring_details["job_descriptions"].items():
-                        with st.expander(f"View {role.upper()} Job Description", expanded=False):
-                            st.markdown(desc)
+            # Show the job descriptions in expandable sections
+            if index == latest_job_descriptions and "job_descriptions" in hiring_details:
+                for role, desc in hiring_details["job_descriptions"].items():
+                    with st.expander(f"View {role.upper()} Job Description", expanded=False):
+                        st.markdown(desc)
             
-            if "hiring plan" in message["content"].lower() and "I've created a hiring plan" in message["content"]:
-                # Extract hiring plans from the memory
-                hiring_details = st.session_state.memory.get("hiring_needs") or {}
-                if "hiring_plan" in hiring_details:
-                    for role, plan_json in hiring_details["hiring_plan"].items():
-                        with st.expander(f"View {role.upper()} Hiring Plan", expanded=False):
-                            try:
-                                plan = json.loads(plan_json)
-                                for stage, tasks in plan.items():
-                                    st.subheader(stage)
-                                    for task in tasks:
-                                        st.write(f"- {task['task']} ({task['timeframe']})")
-                            except Exception as e:
-                                st.write(plan_json)
-                                st.write(f"Error parsing plan: {str(e)}")
+            # Show the hiring plans, rendered once per distinct plan
+            if index == latest_hiring_plan and "hiring_plan" in hiring_details:
+                plan_data = hiring_details.get("hiring_plan_data") or {}
+                for role, plan_json in hiring_details["hiring_plan"].items():
+                    with st.expander(f"View {role.upper()} Hiring Plan", expanded=False):
+                        try:
+                            st.markdown(render_hiring_plan(plan_json, plan_data.get(role)))
+                        except Exception as e:
+                            st.write(plan_json)
+                            st.write(f"Error parsing plan: {str(e)}")
     
     # User input
     user_input = st.chat_input("Type your message here...")
@@ -192,65 +252,45 @@ with tab1:
         st.session_state.analytics.track_message("user", user_input)
         
         # Check for role mentions to track in analytics
-        if "engineer" in user_input.lower():
-            st.session_state.analytics.track_role_request("founding engineer")
-        if "intern" in user_input.lower() or "genai" in user_input.lower():
-            st.session_state.analytics.track_role_request("genai intern")
+        for role in classify(user_input)["roles"]:
+            st.session_state.analytics.track_role_request(role)
         
         # Get response from agent
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                try:
-                    # Create input state for the agent
-                    input_state = {
-                        "messages": [{"role": "human", "content": user_input}]
-                    }
-                    
-                    # Get response from the agent
-                    response = st.session_state.agent.invoke(input_state)
-                    
-                    # Extract the assistant's message from the response
-                    assistant_response = ""
-                    if "messages" in response:
-                        for message in response["messages"]:
-                            if hasattr(message, "type") and message.type == "ai":
-                                assistant_response = message.content
-                            elif isinstance(message, AIMessage):
-                                assistant_response = message.content
-                            elif isinstance(message, dict) and message.get("role") == "assistant":
-                                assistant_response = message.get("content", "")
-                    
-                    if not assistant_response:
-                        # Fall back to a simple response if we couldn't extract one
-                        assistant_response = "I'm processing your request. Could you provide more details about your hiring needs?"
-                    
-                    # Display the response
+            try:
+                # Create input state for the agent
+                input_state = {
+                    "messages": [{"role": "human", "content": user_input}]
+                }
+                
+                # Render the response token by token as it streams in
+                assistant_response = st.write_stream(st.session_state.agent.stream(input_state))
+                
+                if not assistant_response:
+                    # Fall back to a simple response if nothing was generated
+                    assistant_response = "I'm processing your request. Could you provide more details about your hiring needs?"
                     st.write(assistant_response)
-                    
-                    # Add to messages
-                    st.session_state.messages.append({"role": "assistant", "content": assistant_response})
-                    
-                    # Track message in analytics
-                    st.session_state.analytics.track_message("assistant", assistant_response)
-                    
-                    # Check for tool usage in the response
-                    if "search_job_market" in assistant_response:
-                        st.session_state.analytics.track_tool_usage("search_job_market")
-                    if "draft_job_description" in assistant_response:
-                        st.session_state.analytics.track_tool_usage("draft_job_description")
-                    if "create_hiring_checklist" in assistant_response:
-                        st.session_state.analytics.track_tool_usage("create_hiring_checklist")
                 
-                except Exception as e:
-                    error_msg = f"Error getting response from agent: {str(e)}"
-                    st.error(error_msg)
-                    st.code(traceback.format_exc())
-                    
-                    # Add error message to chat
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": "I'm sorry, I encountered an error processing your request. Please try again or start a new session."
-                    })
+                # Add to messages
+                st.session_state.messages.append({"role": "assistant", "content": assistant_response})
+                
+                # Track message in analytics
+                st.session_state.analytics.track_message("assistant", assistant_response)
+                
+                # Check for tool usage in the response
+                for tool_name in classify(assistant_response)["tools"]:
+                    st.session_state.analytics.track_tool_usage(tool_name)
+            
+            except Exception as e:
+                error_msg = f"Error getting response from agent: {str(e)}"
+                st.error(error_msg)
+                st.code(traceback.format_exc())
+                
+                # Add error message to chat
+                st.session_state.messages.append({
+                    "role": "assistant", 
+                    "content": "I'm sorry, I encountered an error processing your request. Please try again or start a new session."
+                })
 
 with tab2:
     st.header("Usage Analytics")
@@ -278,43 +318,51 @@ with tab2:
         else:
             st.write("No tools used yet")
         
+        # Response cache effectiveness
+        response_cache = st.session_state.agent.response_cache
+        if response_cache is not None:
+            st.subheader("Response Cache")
+            cache_stats = response_cache.stats()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Cache Hits", cache_stats["hits"])
+            with col2:
+                st.metric("Cache Misses", cache_stats["misses"])
+            with col3:
+                st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        
+        # Memoized tool results
+        st.subheader("Tool Cache")
+        tool_stats = tool_cache_stats()
+        df = pd.DataFrame.from_dict(tool_stats, orient="index")
+        df.index.name = "tool"
+        st.dataframe(df[["hits", "misses", "hit_rate", "entries", "evictions", "invalidations"]])
+        
+        # Per-stage turn latency from the agent's tracer
+        latency_stats = st.session_state.agent.latency_stats()
+        if latency_stats:
+            st.subheader("Response Latency by Stage")
+            df = pd.DataFrame.from_dict(latency_stats, orient="index")
+            df.index.name = "stage"
+            st.dataframe(df[["count", "p50_ms", "p95_ms", "p99_ms", "max_ms"]].round(2))
+        
         # Show role request distribution
-        analytics_data = analytics._load_analytics()
-        if analytics_data["role_requests"]:
+        role_distribution = analytics.get_role_distribution()
+        if len(role_distribution["role"]):
             st.subheader("Role Request Distribution")
-            role_data = list(analytics_data["role_requests"].items())
-            roles = [item[0] for item in role_data]
-            counts = [item[1] for item in role_data]
             
             # Create a dataframe for the chart
-            df = pd.DataFrame({
-                "role": roles,
-                "count": counts
-            })
+            df = pd.DataFrame(role_distribution)
             
             # Create a simple bar chart
             st.bar_chart(df, x="role", y="count")
         
         # Session activity over time
-        if len(analytics_data["sessions"]) > 1:
+        if stats["total_sessions"] > 1:
             st.subheader("Session Activity")
-            sessions = analytics_data["sessions"]
-            session_dates = [s["start_time"].split("T")[0] for s in sessions]
-            session_count_by_date = {}
-            
-            for date in session_dates:
-                if date not in session_count_by_date:
-                    session_count_by_date[date] = 0
-                session_count_by_date[date] += 1
-            
-            dates = list(session_count_by_date.keys())
-            counts = list(session_count_by_date.values())
             
             # Create a dataframe for the line chart
-            df = pd.DataFrame({
-                "date": dates,
-                "sessions": counts
-            })
+            df = pd.DataFrame(analytics.get_session_activity())
             
             # Create a line chart
             st.line_chart(df, x="date", y="sessions")
@@ -0,0 +1,19 @@
+import contextlib
+import os
+import tempfile
+from typing import Iterator
+
+@contextlib.contextmanager
+def scratch_directory() -> Iterator[str]:
+    """Run the body from a fresh temporary directory, so data/ files land there
+
+    The previous working directory is restored and the directory removed
+    afterwards, even if the body raises.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            yield scratch
+        finally:
+            os.chdir(cwd)
@@ -0,0 +1,111 @@
+"""Run the benchmark suite and write one machine-readable JSON report.
+
+    python -m benchmarks                                   # print the report
+    python -m benchmarks --output bench/HEAD.json          # save it
+    python -m benchmarks --only hot_paths --compare bench/main.json
+
+Reports record the git commit, so reports from two commits can be diffed
+with --compare, which lists every timing that moved by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+SUITE = ("hot_paths", "write_behind", "chat_history", "async_throughput")
+
+# Metrics where a larger value is worse; every other numeric metric is a rate
+TIMING_SUFFIXES = ("us_per_call", "_per_turn", "_ms")
+# Workload parameters echoed in results, not measurements
+PARAMETER_SUFFIXES = ("calls", "sessions", "history_messages", "turns", "response_chars", "llm_latency_ms", "rows")
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(name: str) -> Dict[str, Any]:
+    """Run one benchmark module in a fresh interpreter and parse its JSON output
+
+    Each module runs in its own process so process-wide singletons (storage
+    backend, runtimes, rollups) never leak from one benchmark into the next.
+    """
+    output = subprocess.run([sys.executable, "-m", f"benchmarks.bench_{name}"], capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output)
+
+def run_suite(names=SUITE) -> Dict[str, Any]:
+    """Run the named benchmark modules and wrap their results with run metadata"""
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {}
+    }
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        report["benchmarks"][name] = run_benchmark(name)
+    return report
+
+def _metrics(value: Any, path: str = "") -> Iterator[Tuple[str, float]]:
+    """Flatten a report into (path, number) pairs; list items are keyed by position"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _metrics(item, f"{path}.{key}" if path else key)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _metrics(item, f"{path}[{index}]")
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield path, float(value)
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> Dict[str, Any]:
+    """Metrics that changed by more than `threshold`, split into regressions and improvements"""
+    before = dict(_metrics(baseline["benchmarks"]))
+    changes = {"regressions": [], "improvements": []}
+    for path, value in _metrics(current["benchmarks"]):
+        old = before.get(path)
+        if not old or path.endswith(PARAMETER_SUFFIXES):
+            continue
+        ratio = value / old
+        if abs(ratio - 1) <= threshold:
+            continue
+        worse = ratio > 1 if path.endswith(TIMING_SUFFIXES) else ratio < 1
+        changes["regressions" if worse else "improvements"].append(
+            {"metric": path, "baseline": old, "current": value, "ratio": ratio}
+        )
+    return changes
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the HR agent benchmark suite")
+    parser.add_argument("--only", nargs="+", choices=SUITE, default=list(SUITE))
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", help="Baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change worth reporting")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.only)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(baseline, report, args.threshold)
+        report["comparison"]["baseline_commit"] = baseline.get("commit")
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare and report["comparison"]["regressions"]:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
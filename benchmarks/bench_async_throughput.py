@@ -0,0 +1,65 @@
+"""Turn throughput of sequential HRAgent.invoke vs concurrent ainvoke_many.
+
+The LLM is replaced by a stub runnable with a fixed latency, so the numbers
+reflect how well one process overlaps many sessions' model calls and
+persistence. Run from the repository root:
+
+    python -m benchmarks.bench_async_throughput
+"""
+import asyncio
+import json
+import time
+from typing import Dict, Any
+
+from langchain_core.runnables import RunnableLambda
+
+from agent.agent import create_hr_agent, ainvoke_many
+from benchmarks import scratch_directory
+
+SESSIONS = 50
+LLM_LATENCY_SECONDS = 0.05
+STUB_RESPONSE = "For a founding engineer, plan on a 6 week process with a system design interview."
+
+def _stub_llm(_inputs):
+    time.sleep(LLM_LATENCY_SECONDS)
+    return STUB_RESPONSE
+
+async def _astub_llm(_inputs):
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    return STUB_RESPONSE
+
+def make_agents(label: str, sessions: int):
+    agents = []
+    for i in range(sessions):
+        agent = create_hr_agent("sk-benchmark", f"bench_async_{label}_{i}")
+        agent.chain = RunnableLambda(_stub_llm, afunc=_astub_llm)
+        agents.append(agent)
+    return agents
+
+def turn_input(i: int) -> Dict[str, Any]:
+    return {"messages": [{"role": "human", "content": f"What should the interview loop look like for hire {i}?"}]}
+
+def run(sessions: int = SESSIONS) -> Dict[str, Any]:
+    """Time one turn per session, sequentially and concurrently, in a scratch directory"""
+    with scratch_directory():
+        agents = make_agents("sync", sessions)
+        start = time.perf_counter()
+        for i, agent in enumerate(agents):
+            agent.invoke(turn_input(i))
+        sequential = time.perf_counter() - start
+
+        agents = make_agents("async", sessions)
+        start = time.perf_counter()
+        asyncio.run(ainvoke_many([(agent, turn_input(i)) for i, agent in enumerate(agents)]))
+        concurrent = time.perf_counter() - start
+
+    return {
+        "benchmark": "async_throughput",
+        "sessions": sessions,
+        "llm_latency_ms": LLM_LATENCY_SECONDS * 1000,
+        "sequential_turns_per_second": sessions / sequential,
+        "concurrent_turns_per_second": sessions / concurrent
+    }
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,55 @@
+"""Per-turn cost of HRAgent._get_chat_history as the session history grows.
+
+Compares the incrementally maintained message cache against rebuilding every
+LangChain message on each turn. Run from the repository root:
+
+    python -m benchmarks.bench_chat_history
+"""
+import json
+import time
+from typing import Dict, Any
+
+from agent.agent import create_hr_agent
+from benchmarks import scratch_directory
+
+HISTORY_SIZES = (10, 1000, 10000)
+TURNS = 50
+
+def time_turns(agent, turns: int, rebuild: bool) -> float:
+    """Average seconds per turn to append one exchange and fetch the history"""
+    elapsed = 0.0
+    for i in range(turns):
+        agent.memory.add_to_conversation("human", f"Follow-up question {i} about the hiring plan")
+        agent.memory.add_to_conversation("ai", "Here is an updated suggestion for the plan. " * 10)
+        if rebuild:
+            # Forget the cache so the whole history is converted again
+            agent._history_source = None
+        start = time.perf_counter()
+        agent._get_chat_history()
+        elapsed += time.perf_counter() - start
+    return elapsed / turns
+
+def run_size(size: int, turns: int = TURNS) -> Dict[str, Any]:
+    agent = create_hr_agent("sk-benchmark", f"bench_history_{size}", write_behind=True)
+    for i in range(size // 2):
+        agent.memory.add_to_conversation("human", f"We are hiring for role number {i}, what should we look for?")
+        agent.memory.add_to_conversation("ai", "Look for strong fundamentals and ownership. " * 10)
+    agent._get_chat_history()
+
+    result = {
+        "history_messages": size,
+        "incremental_us_per_turn": time_turns(agent, turns, rebuild=False) * 1e6,
+        "rebuild_us_per_turn": time_turns(agent, turns, rebuild=True) * 1e6
+    }
+    # Flush while still inside the scratch directory
+    agent.close()
+    return result
+
+def run(sizes=HISTORY_SIZES, turns: int = TURNS) -> Dict[str, Any]:
+    """Run every history size in a scratch directory"""
+    with scratch_directory():
+        results = [run_size(size, turns) for size in sizes]
+    return {"benchmark": "chat_history", "results": results}
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
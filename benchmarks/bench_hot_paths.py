@@ -0,0 +1,179 @@
+"""Per-call cost of the agent's hot paths: memory, analytics, tools, market search, extraction, invoke.
+
+Every case runs offline in a scratch directory; end-to-end turns use a
+scripted chat model with no added latency, so they measure the agent's own
+overhead (history, persistence, extraction, caching). Run from the repository root:
+
+    python -m benchmarks.bench_hot_paths
+"""
+import json
+import os
+import random
+import time
+from typing import Dict, Any, Callable
+
+from agent.agent import create_hr_agent
+from agent.analytics import AnalyticsTracker
+from agent.market import MarketIndex
+from agent.memory import SessionMemory
+from agent.models import ScriptedChatModel
+from agent.runtime import register_model_backend
+from agent.storage import JsonFileBackend
+from agent.tools import draft_job_description, create_hiring_checklist, create_hiring_checklists
+from benchmarks import scratch_directory
+
+MEMORY_SIZES = (10, 1000, 10000)
+ANALYTICS_SESSIONS = 10000
+CALLS = 200
+BATCH_ROLES = [f"{level} {title}" for level in ("junior", "senior", "staff", "principal", "lead")
+               for title in ("backend engineer", "data engineer", "ml intern", "product designer",
+                             "data analyst", "frontend engineer", "design intern", "recruiter")] * 5
+MARKET_ROWS = 100000
+# Title and skill words for the synthetic market dataset, most frequent first
+MARKET_TITLE_WORDS = ("senior", "engineer", "manager", "software", "data", "lead", "analyst", "junior", "product",
+                      "backend", "designer", "staff", "frontend", "platform", "scientist", "security", "principal",
+                      "mobile", "cloud", "intern", "machine", "learning", "research", "growth", "infrastructure",
+                      "devops", "reliability", "embedded", "quantitative", "firmware", "compiler", "robotics")
+MARKET_SKILLS = ("Python", "SQL", "Kubernetes", "React", "Go", "Java", "Figma", "Spark", "PyTorch", "Terraform",
+                 "Excel", "Tableau", "Rust", "C++", "Swift", "Kotlin", "Airflow", "dbt", "Snowflake", "GraphQL")
+MARKET_QUERIES = ("senior backend engineer", "machine learning engineer python", "product designer figma",
+                  "data scientist", "robotics firmware engineer", "platfrom engineer kubernetes", "rust", "intern")
+LONG_RESPONSE = (
+    "For the founding engineer you should budget $140,000-$170,000 and look for 5+ years of experience "
+    "with distributed systems. The GenAI intern can be paid $35-45/hour. Plan a 10 week timeline "
+    "covering sourcing, screening and a system design interview. "
+) * 40
+
+def _time_calls(fn: Callable[[int], Any], calls: int) -> Dict[str, float]:
+    """Average latency and throughput of fn(i) over `calls` calls"""
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    return {"calls": calls, "us_per_call": elapsed * 1e6 / calls, "calls_per_second": calls / elapsed}
+
+def bench_memory(calls: int = CALLS) -> list:
+    """SessionMemory.add_to_conversation with an existing history of each size"""
+    results = []
+    for size in MEMORY_SIZES:
+        for write_behind in (False, True):
+            memory = SessionMemory(f"bench_memory_{size}_{write_behind}", write_behind=write_behind,
+                                   backend=JsonFileBackend())
+            for i in range(size):
+                memory.add_to_conversation("human" if i % 2 == 0 else "ai", f"Seed message {i} about hiring")
+            memory.flush()
+            result = _time_calls(lambda i: memory.add_to_conversation("human", f"New message {i}"), calls)
+            memory.flush()
+            result.update({"history_messages": size, "write_behind": write_behind})
+            results.append(result)
+    return results
+
+def bench_analytics(sessions: int = ANALYTICS_SESSIONS, calls: int = CALLS) -> Dict[str, Any]:
+    """AnalyticsTracker.track_message and the dashboard rollup after `sessions` sessions"""
+    backend = JsonFileBackend()
+    for i in range(sessions):
+        tracker = AnalyticsTracker(f"bench_analytics_{i}", backend=backend)
+        tracker.track_message("human", "hello")
+    tracker = AnalyticsTracker("bench_analytics_live", backend=backend)
+
+    # The first rollup folds every event; later ones only read the tail
+    start = time.perf_counter()
+    tracker.get_usage_stats()
+    cold_rollup = time.perf_counter() - start
+
+    result = _time_calls(lambda i: tracker.track_message("human", f"Message {i}"), calls)
+    start = time.perf_counter()
+    tracker.get_usage_stats()
+    warm_rollup = time.perf_counter() - start
+
+    result.update({
+        "sessions": sessions,
+        "cold_usage_stats_ms": cold_rollup * 1000,
+        "warm_usage_stats_ms": warm_rollup * 1000
+    })
+    return result
+
+def bench_tools(calls: int = CALLS) -> Dict[str, Any]:
+    """Throughput of the document-generating tools, and of checklists for 200 roles in one call"""
+    return {
+        "draft_job_description": _time_calls(lambda i: draft_job_description.invoke({
+            "role": "founding engineer",
+            "skills": ["Python", "System architecture", f"Skill {i}"],
+            "experience_level": "3-5 years"
+        }), calls),
+        "create_hiring_checklist": _time_calls(lambda i: create_hiring_checklist.invoke({
+            "role": "founding engineer",
+            "timeline_weeks": 2 + i % 12
+        }), calls),
+        "create_hiring_checklists_batch": _time_calls(lambda i: create_hiring_checklists.invoke({
+            "roles": BATCH_ROLES,
+            "timeline_weeks": 2 + i % 12
+        }), calls)
+    }
+
+def _write_market_data(path: str, rows: int) -> None:
+    """Synthetic market CSV whose title words follow a long-tailed (1/rank) frequency"""
+    rng = random.Random(0)
+    weights = [1 / rank for rank in range(1, len(MARKET_TITLE_WORDS) + 1)]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("role,avg_salary,demand,skills_in_demand\n")
+        for i in range(rows):
+            title = " ".join(rng.choices(MARKET_TITLE_WORDS, weights, k=rng.randint(2, 4)))
+            skills = ";".join(rng.sample(MARKET_SKILLS, 4))
+            f.write(f'{title} {i},"$100,000-$130,000",High,{skills}\n')
+
+def bench_market(rows: int = MARKET_ROWS, calls: int = CALLS) -> Dict[str, Any]:
+    """MarketIndex.search over a synthetic dataset of `rows` roles, plus the one-off index build"""
+    path = os.path.abspath("bench_market.csv")
+    _write_market_data(path, rows)
+    index = MarketIndex(path)
+    start = time.perf_counter()
+    len(index)
+    build = time.perf_counter() - start
+    result = _time_calls(lambda i: index.search(MARKET_QUERIES[i % len(MARKET_QUERIES)]), calls)
+    result.update({"market_rows": rows, "index_build_ms": build * 1000})
+    return result
+
+def bench_extraction(calls: int = CALLS) -> Dict[str, Any]:
+    """HRAgent._extract_hiring_details on a long model response"""
+    agent = create_hr_agent("sk-benchmark", "bench_extraction", write_behind=True, model_backend="bench")
+    result = _time_calls(
+        lambda i: agent._extract_hiring_details(f"We need a founding engineer, request {i}", LONG_RESPONSE),
+        calls
+    )
+    agent.memory.flush()
+    result["response_chars"] = len(LONG_RESPONSE)
+    return result
+
+def bench_invoke(calls: int = CALLS) -> list:
+    """End-to-end HRAgent.invoke turns against the zero-latency scripted model"""
+    results = []
+    for cache_enabled in (False, True):
+        agent = create_hr_agent("sk-benchmark", f"bench_invoke_{cache_enabled}", model_backend="bench")
+        agent.cache_enabled = cache_enabled
+        result = _time_calls(lambda i: agent.invoke({"messages": [
+            {"role": "human", "content": f"What should the interview loop look like for candidate {i % 10}?"}
+        ]}), calls)
+        result["response_cache"] = cache_enabled
+        results.append(result)
+    return results
+
+def run(calls: int = CALLS, analytics_sessions: int = ANALYTICS_SESSIONS) -> Dict[str, Any]:
+    """Run every hot-path case in a scratch directory"""
+    register_model_backend("bench", lambda openai_api_key, model, temperature: ScriptedChatModel(
+        responses=[LONG_RESPONSE[:600]], latency_mean=0.0, latency_stddev=0.0,
+        tokens_per_second=1e9, tokens_per_second_stddev=0.0
+    ))
+    with scratch_directory():
+        results = {
+            "memory_add_to_conversation": bench_memory(calls),
+            "analytics_track_message": bench_analytics(analytics_sessions, calls),
+            "tools": bench_tools(calls),
+            "market_search": bench_market(MARKET_ROWS, calls),
+            "extract_hiring_details": bench_extraction(calls),
+            "agent_invoke": bench_invoke(calls)
+        }
+    return {"benchmark": "hot_paths", "results": results}
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,56 @@
+"""Compare journal and catalog writes/fsyncs per agent turn with and without write-behind.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_write_behind
+"""
+import json
+import time
+from typing import Dict, Any
+
+from agent.memory import SessionMemory
+from agent.storage import JsonFileBackend, SqliteBackend
+from benchmarks import scratch_directory
+
+TURNS = 200
+
+def simulate_turns(memory: SessionMemory, turns: int) -> None:
+    """Replay the persistence pattern of one HRAgent.invoke turn"""
+    hiring_details = {"roles": [], "skills": {}, "experience": {}, "timeline": None, "budget": {}}
+    for i in range(turns):
+        memory.add_to_conversation("human", f"We need to hire engineer #{i} within 8 weeks")
+        memory.add_to_conversation("ai", "Here is what I'd suggest for that role... " * 20)
+        hiring_details["roles"].append(f"engineer {i}")
+        memory.update("hiring_needs", hiring_details)
+        # HRAgent.invoke flushes at the end of every turn
+        memory.flush()
+
+def run_mode(label: str, turns: int = TURNS, backend=None, **options) -> Dict[str, Any]:
+    memory = SessionMemory(f"bench_{label}", backend=backend or JsonFileBackend(), **options)
+    start = time.perf_counter()
+    simulate_turns(memory, turns)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": label,
+        "turns": turns,
+        "writes_per_turn": memory.io_stats["writes"] / turns,
+        "fsyncs_per_turn": memory.io_stats["fsyncs"] / turns,
+        "snapshots": memory.io_stats["snapshots"],
+        "ms_per_turn": elapsed * 1000 / turns
+    }
+
+def run(turns: int = TURNS) -> Dict[str, Any]:
+    """Run every persistence mode in a scratch directory"""
+    with scratch_directory():
+        results = [
+            run_mode("sync", turns),
+            run_mode("sync_fsync", turns, durability="fsync"),
+            run_mode("write_behind", turns, write_behind=True),
+            run_mode("write_behind_fsync", turns, write_behind=True, durability="fsync"),
+            run_mode("sqlite", turns, backend=SqliteBackend()),
+            run_mode("sqlite_write_behind", turns, backend=SqliteBackend(), write_behind=True)
+        ]
+    return {"benchmark": "write_behind", "results": results}
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,57 @@
+import time
+
+from agent.extraction import extract_details, merge_details
+
+def _merge_turns(*turns):
+    hiring_details = {}
+    for turn in turns:
+        merge_details(hiring_details, extract_details(turn))
+    return hiring_details
+
+def test_head_noun_follow_up_updates_known_role():
+    details = _merge_turns(
+        "I need to hire a founding engineer and a GenAI intern. Can you help?",
+        "I have a budget of $120K for an engineer. Is that reasonable?"
+    )
+    assert details["roles"] == ["founding engineer", "genai intern"]
+    assert details["budget"] == {"founding engineer": "$120,000"}
+
+def test_shorter_title_prefers_most_recent_matching_role():
+    details = _merge_turns(
+        "We are hiring a senior backend engineer and a founding engineer",
+        "The engineer needs 5+ years"
+    )
+    assert details["roles"] == ["senior backend engineer", "founding engineer"]
+    assert details["experience"] == {"founding engineer": "5+ years"}
+
+def test_distinct_title_with_same_head_noun_is_a_new_role():
+    details = _merge_turns("We need a founding engineer", "Also a data engineer")
+    assert details["roles"] == ["founding engineer", "data engineer"]
+
+def test_skill_list_stops_at_budget():
+    details = extract_details("We need a backend engineer, skills: Python, Go and Kubernetes, budget $150k-180k")
+    assert details["skills"] == {"backend engineer": ["Python", "Go", "Kubernetes"]}
+    assert details["budget"] == {"backend engineer": "$150,000-$180,000"}
+
+def test_skill_list_stops_at_salary_and_timeline():
+    details = extract_details("Founding engineer with experience in React and TypeScript, salary around $140k")
+    assert details["skills"] == {"founding engineer": ["React", "TypeScript"]}
+    details = extract_details("ML engineer, skills: PyTorch, MLOps, timeline 6 weeks")
+    assert details["skills"] == {"ml engineer": ["PyTorch", "MLOps"]}
+    assert details["timeline"] == 6
+
+def test_skill_list_stops_before_years_of_experience():
+    details = extract_details("A data engineer with skills in Spark and Airflow with 5+ years")
+    assert details["skills"] == {"data engineer": ["Spark", "Airflow"]}
+    assert details["experience"] == {"data engineer": "5+ years"}
+
+def test_long_digit_runs_scan_in_linear_time():
+    start = time.perf_counter()
+    extract_details("9" * 50000)
+    extract_details("1," * 20000)
+    assert time.perf_counter() - start < 1.0
+
+def test_overflowing_amount_is_not_a_budget():
+    details = extract_details("We need an engineer. Budget is $" + "9" * 400)
+    assert details["roles"] == ["engineer"]
+    assert details["budget"] == {}